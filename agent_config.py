@@ -102,6 +102,9 @@ class AgentSettings(BaseSettings):
     kite_api_secret: Optional[str] = None
     kite_access_token: Optional[str] = None
     kite_request_token: Optional[str] = None
+    kite_stream_quotes: bool = True          # Serve quotes from the KiteTicker WebSocket (REST fallback)
+    kite_tick_max_age_seconds: float = 30.0  # Older streamed prices are ignored in favour of REST
+    kite_instruments_cache_ttl_seconds: float = 86400.0  # Reuse the NFO instrument dump (Kite regenerates it daily)
 
     # ──────────────────────────────────────────────
     # India Broker — ICICI Direct / Breeze
@@ -160,6 +163,7 @@ class AgentSettings(BaseSettings):
     # ──────────────────────────────────────────────
     log_dir: str = "__logs__"
     log_file_name: str = "agent.jsonl"
+    log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "INFO"
     ai_trade_review_file_name: str = "ai_trade_review.jsonl"
     
     @property
@@ -186,6 +190,25 @@ class AgentSettings(BaseSettings):
     partial_sell_pct: Optional[float] = None
     max_scale_outs: Optional[int] = None
 
+    # ──────────────────────────────────────────────
+    # Broker Call Tuning
+    # ──────────────────────────────────────────────
+    quote_cache_ttl_seconds: float = 0.25  # reuse a broker quote within this window (0 = off)
+    balance_cache_ttl_seconds: float = 5.0  # reuse the cash balance; cleared after each order (0 = off)
+    positions_cache_ttl_seconds: float = 2.0  # reuse positions; cleared after each order (0 = off)
+    broker_call_timeout_seconds: float = 2.0  # upper bound on a single broker read
+    broker_max_concurrency: int = 8  # concurrent API calls allowed per broker
+    broker_breaker_failure_threshold: int = 3  # consecutive failures before failing fast
+    broker_breaker_reset_seconds: float = 5.0  # how long to fail fast before retrying
+
+    # ──────────────────────────────────────────────
+    # Market Data Caching (0 TTL = off)
+    # ──────────────────────────────────────────────
+    market_data_cache_dir: str = "__cache__"
+    quote_snapshot_ttl_seconds: float = 5.0
+    history_cache_ttl_seconds: float = 3600.0
+    option_chain_cache_ttl_seconds: float = 900.0
+
     # ──────────────────────────────────────────────
     # Transaction Fee Estimates
     # ──────────────────────────────────────────────
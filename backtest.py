@@ -3,15 +3,11 @@ import asyncio
 import pandas as pd
 import yfinance as yf
 from datetime import datetime, timedelta
-import os
-import sys
-
-# Ensure project root is in path
-sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 from rich.console import Console
 from strategy.technical import TechAnalyzer
 from strategy.ai import AIAnalyzer
+from trader import install_event_loop_policy
 
 console = Console()
 
@@ -149,4 +145,5 @@ if __name__ == "__main__":
     parser.add_argument("--capital", type=float, default=10000.0, help="Initial capital in USD/INR")
     
     args = parser.parse_args()
+    install_event_loop_policy()
     asyncio.run(run_backtest(args.symbol, args.days, args.capital))
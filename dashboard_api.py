@@ -5,7 +5,6 @@ Run: python dashboard_api.py   (uvicorn on :8050)
 """
 
 import os
-import sys
 import json
 import ast
 import sqlite3
@@ -17,15 +16,12 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, JSONResponse
 from pydantic import BaseModel
 
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from agent_config import settings
 
 # ── Paths ──
 TRADING_DB = settings.trading_db_path
 DASHBOARD_DIR = os.path.join(os.path.dirname(__file__), "dashboard")
 
-# Add strategy dir to path so we can import fx module
-sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "strategy"))
 try:
     from strategy.fx import get_usd_inr_rate
 except ImportError:
@@ -757,6 +753,8 @@ async def analyze_symbol_api(req: AnalyzeRequest):
         }
     except Exception as e:
         return JSONResponse(status_code=500, content={"error": str(e)})
+    finally:
+        await market_data.close()
 
 
 # ── Static Files + SPA Fallback ──
@@ -1,17 +1,15 @@
 import asyncio
+import logging
 import structlog
-import sys
 import os
 from datetime import datetime
 from decimal import Decimal
 
-# Adjust path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 from agent_config import settings
 from trader.us.robinhood import RobinhoodTrader
 from trader.india.zerodha import ZerodhaTrader
 from trader.india.icici import ICICITrader
+from trader import SHARED_IO_POOL, install_event_loop_policy
 from trader.router import BrokerRouter
 from strategy.engine import StrategyEngine
 from strategy.risk import RiskManager
@@ -31,24 +29,58 @@ structlog.configure(
         structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
     ],
     logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
+    # Methods below the configured level are bound to a no-op, so a
+    # filtered-out call returns before building an event dict or entering
+    # the processor chain
+    wrapper_class=structlog.make_filtering_bound_logger(logging.getLevelName(settings.log_level)),
     cache_logger_on_first_use=True,
 )
 
 # File Handler
-import logging
+import atexit
+import logging.handlers
+import queue
 file_handler = logging.FileHandler(settings.log_file_path)
+try:
+    import orjson
+
+    def _dumps_json(obj, **kwargs) -> str:
+        # orjson emits bytes; the stdlib handler expects a str
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, **kwargs).decode()
+except ImportError:
+    import json
+    _dumps_json = json.dumps
+
 json_formatter = structlog.stdlib.ProcessorFormatter(
-    processor=structlog.processors.JSONRenderer(),
+    processor=structlog.processors.JSONRenderer(serializer=_dumps_json),
 )
 file_handler.setFormatter(json_formatter)
 console_handler = logging.StreamHandler()
 console_handler.setFormatter(logging.Formatter("%(message)s"))
 
+
+
+class _PassthroughQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records as-is; formatting happens on the listener thread."""
+
+    def prepare(self, record):
+        # The default prepare() formats to a string, which would flatten
+        # structlog's event dict before ProcessorFormatter sees it.
+        return record
+
+
+# File and console writes happen on a listener thread so a log call on the
+# event loop is a queue put, never a blocking write.
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(
+    log_queue, file_handler, console_handler, respect_handler_level=True
+)
+log_listener.start()
+atexit.register(log_listener.stop)
+
 root_logger = logging.getLogger()
-root_logger.addHandler(file_handler)
-root_logger.addHandler(console_handler)
-root_logger.setLevel(logging.INFO)
+root_logger.addHandler(_PassthroughQueueHandler(log_queue))
+root_logger.setLevel(settings.log_level)
 
 # OpenTelemetry Setup
 try:
@@ -306,6 +338,9 @@ async def trading_loop():
         return
     
     await init_db()
+
+    # Route default-executor work (run_in_executor(None, ...)) to the shared broker I/O pool
+    asyncio.get_running_loop().set_default_executor(SHARED_IO_POOL)
     
     # Set up Broker Router (US vs India)
     router = await setup_broker_router()
@@ -356,135 +391,139 @@ async def trading_loop():
     
     from strategy.market_hours import filter_tickers_by_market_hours, get_market_status
     
-    while True:
-        try:
-            # Refresh config
-            await load_dynamic_config(risk_managers)
+    try:
+        while True:
+            try:
+                # Refresh config
+                await load_dynamic_config(risk_managers)
             
-            # CHECK KILL SWITCH
-            async with trading_session() as session:
-                result = await session.execute(select(AppConfig).where(AppConfig.key == "TRADING_STATUS"))
-                status_row = result.scalar_one_or_none()
-                if status_row and status_row.value == "PAUSED":
-                    logger.warning("trading_paused_by_kill_switch", status="PAUSED")
-                    await asyncio.sleep(10)
-                    continue
+                # CHECK KILL SWITCH
+                async with trading_session() as session:
+                    result = await session.execute(select(AppConfig).where(AppConfig.key == "TRADING_STATUS"))
+                    status_row = result.scalar_one_or_none()
+                    if status_row and status_row.value == "PAUSED":
+                        logger.warning("trading_paused_by_kill_switch", status="PAUSED")
+                        await asyncio.sleep(10)
+                        continue
             
-            current_time = datetime.now()
+                current_time = datetime.now()
             
-            # Log market status
-            market_status = get_market_status()
+                # Log market status
+                market_status = get_market_status()
             
-            # --- Sync with Brokers ---
-            us_broker = router.get_broker_for_symbol("AAPL") 
-            if us_broker and "US" in risk_managers:
-                 try:
-                     pos = await us_broker.get_positions()
-                     bal = await us_broker.get_account_balance()
-                     risk_managers["US"].sync_from_broker(pos, bal)
-                 except Exception as e:
-                     logger.error("us_broker_sync_failed", error=str(e))
+                # --- Sync with Brokers ---
+                us_broker = router.get_broker_for_symbol("AAPL") 
+                if us_broker and "US" in risk_managers:
+                     try:
+                         snap = await us_broker.snapshot()
+                         risk_managers["US"].sync_from_broker(snap.positions, snap.balance)
+                     except Exception as e:
+                         logger.error("us_broker_sync_failed", error=str(e))
                  
-            in_broker = router.get_broker_for_symbol("RELIANCE.NS")
-            if in_broker and "IN" in risk_managers:
-                 try:
-                     pos = await in_broker.get_positions()
-                     bal = await in_broker.get_account_balance()
-                     risk_managers["IN"].sync_from_broker(pos, bal)
-                 except Exception as e:
-                     logger.error("india_broker_sync_failed", error=str(e))
+                in_broker = router.get_broker_for_symbol("RELIANCE.NS")
+                if in_broker and "IN" in risk_managers:
+                     try:
+                         snap = await in_broker.snapshot()
+                         risk_managers["IN"].sync_from_broker(snap.positions, snap.balance)
+                     except Exception as e:
+                         logger.error("india_broker_sync_failed", error=str(e))
             
-            # 1. Fast Risk Check (trailing stop + partial sell + hard stop)
-            try:
-                sl_signals = await engine.check_risks(risk_managers)
-                if sl_signals:
-                    logger.info("executing_risk_signals", count=len(sl_signals),
-                               actions=[s.action for s in sl_signals])
-                    await execute_signals(sl_signals, router, risk_managers)
-            except Exception as e:
-                logger.error("fast_risk_check_failed", error=str(e))
-
-            # 2. Market Scan (Every 30m — discovers new trending stocks)
-            tickers = list(settings.all_tickers)
-            if (current_time - last_scan_time).total_seconds() > 1800:
-                trending_tickers = await scanner.scan_market()
-                if trending_tickers:
-                    logger.info("adding_trending_stocks", tickers=trending_tickers)
-                    for t in trending_tickers:
-                        if t not in tickers:
-                            tickers.append(t)
-                last_scan_time = current_time
-
-            # 2.5 Macro Sentiment Check (Every 15m)
-            if (current_time - last_macro_analysis_time).total_seconds() > 900:
-                macro_state = await macro_agent.analyze_regime()
-                logger.info("macro_state_update", regime=macro_state.regime, 
-                            circuit_breaker=macro_state.circuit_breaker_active)
-                last_macro_analysis_time = current_time
-
-            # 3. Holdings Focused Analysis (Every 60s)
-            current_holdings = []
-            for rm in risk_managers.values():
-                current_holdings.extend(list(rm.positions.keys()))
+                # 1. Fast Risk Check (trailing stop + partial sell + hard stop)
+                try:
+                    sl_signals = await engine.check_risks(risk_managers)
+                    if sl_signals:
+                        logger.info("executing_risk_signals", count=len(sl_signals),
+                                   actions=[s.action for s in sl_signals])
+                        await execute_signals(sl_signals, router, risk_managers)
+                except Exception as e:
+                    logger.error("fast_risk_check_failed", error=str(e))
+
+                # 2. Market Scan (Every 30m — discovers new trending stocks)
+                tickers = list(settings.all_tickers)
+                if (current_time - last_scan_time).total_seconds() > 1800:
+                    trending_tickers = await scanner.scan_market()
+                    if trending_tickers:
+                        logger.info("adding_trending_stocks", tickers=trending_tickers)
+                        for t in trending_tickers:
+                            if t not in tickers:
+                                tickers.append(t)
+                    last_scan_time = current_time
+
+                # 2.5 Macro Sentiment Check (Every 15m)
+                if (current_time - last_macro_analysis_time).total_seconds() > 900:
+                    macro_state = await macro_agent.analyze_regime()
+                    logger.info("macro_state_update", regime=macro_state.regime, 
+                                circuit_breaker=macro_state.circuit_breaker_active)
+                    last_macro_analysis_time = current_time
+
+                # 3. Holdings Focused Analysis (Every 60s)
+                current_holdings = []
+                for rm in risk_managers.values():
+                    current_holdings.extend(list(rm.positions.keys()))
                 
-            if current_holdings and (current_time - last_holdings_analysis_time).total_seconds() > 60:
-                logger.info("starting_holdings_analysis", count=len(current_holdings))
-                active_h_tickers, _ = filter_tickers_by_market_hours(current_holdings, paper_mode=is_paper)
-                if active_h_tickers:
-                    h_signals = await engine.run_cycle(active_h_tickers)
+                if current_holdings and (current_time - last_holdings_analysis_time).total_seconds() > 60:
+                    logger.info("starting_holdings_analysis", count=len(current_holdings))
+                    active_h_tickers, _ = filter_tickers_by_market_hours(current_holdings, paper_mode=is_paper)
+                    if active_h_tickers:
+                        h_signals = await engine.run_cycle(active_h_tickers)
                     
-                    # Enforce Circuit Breaker: Halt all new buys
-                    if macro_agent.current_state.circuit_breaker_active:
-                        original_count = len(h_signals)
-                        h_signals = [s for s in h_signals if "BUY" not in s.action]
-                        if original_count != len(h_signals):
-                            logger.warning("circuit_breaker_filtered_buys", 
-                                           filtered=original_count - len(h_signals))
+                        # Enforce Circuit Breaker: Halt all new buys
+                        if macro_agent.current_state.circuit_breaker_active:
+                            original_count = len(h_signals)
+                            h_signals = [s for s in h_signals if "BUY" not in s.action]
+                            if original_count != len(h_signals):
+                                logger.warning("circuit_breaker_filtered_buys", 
+                                               filtered=original_count - len(h_signals))
                                            
-                    await execute_signals(h_signals, router, risk_managers)
-                last_holdings_analysis_time = current_time
+                        await execute_signals(h_signals, router, risk_managers)
+                    last_holdings_analysis_time = current_time
 
-            # 4. Full Discovery & Watchlist Analysis (Every 180s)
-            if (current_time - last_full_analysis_time).total_seconds() > 180:
-                logger.info("starting_full_watchlist_analysis", style=settings.trading_style)
+                # 4. Full Discovery & Watchlist Analysis (Every 180s)
+                if (current_time - last_full_analysis_time).total_seconds() > 180:
+                    logger.info("starting_full_watchlist_analysis", style=settings.trading_style)
                 
-                if macro_agent.current_state.circuit_breaker_active:
-                    logger.warning("circuit_breaker_active_skipping_watchlist_scans", 
-                                   regime=macro_agent.current_state.regime)
-                    last_full_analysis_time = current_time
-                else:
-                    # Filter tickers by regional market hours
-                    active_tickers, skipped_tickers = filter_tickers_by_market_hours(tickers, paper_mode=is_paper)
+                    if macro_agent.current_state.circuit_breaker_active:
+                        logger.warning("circuit_breaker_active_skipping_watchlist_scans", 
+                                       regime=macro_agent.current_state.regime)
+                        last_full_analysis_time = current_time
+                    else:
+                        # Filter tickers by regional market hours
+                        active_tickers, skipped_tickers = filter_tickers_by_market_hours(tickers, paper_mode=is_paper)
                     
-                    if skipped_tickers:
-                        logger.info("tickers_skipped_market_closed", skipped=skipped_tickers)
+                        if skipped_tickers:
+                            logger.info("tickers_skipped_market_closed", skipped=skipped_tickers)
                     
-                    if not active_tickers:
-                        logger.info("no_active_markets_skipping_analysis")
-                    else:
-                        signals = await engine.run_cycle(active_tickers)
-                        await execute_signals(signals, router, risk_managers)
+                        if not active_tickers:
+                            logger.info("no_active_markets_skipping_analysis")
+                        else:
+                            signals = await engine.run_cycle(active_tickers)
+                            await execute_signals(signals, router, risk_managers)
                         
-                        # Log end-of-cycle status
-                        for rgn, rm in risk_managers.items():
-                            logger.info("cycle_region_status", 
-                                        region=rgn,
-                                        capital_remaining=str(rm.current_capital),
-                                        open_positions=len(rm.positions),
-                                        daily_trades=rm.daily_trade_count)
+                            # Log end-of-cycle status
+                            for rgn, rm in risk_managers.items():
+                                logger.info("cycle_region_status", 
+                                            region=rgn,
+                                            capital_remaining=str(rm.current_capital),
+                                            open_positions=len(rm.positions),
+                                            daily_trades=rm.daily_trade_count)
                                         
-                    last_full_analysis_time = current_time
+                        last_full_analysis_time = current_time
             
-            await asyncio.sleep(10)
+                await asyncio.sleep(10)
+
+            except KeyboardInterrupt:
+                logger.info("agent_stopping_user_request")
+                break
+            except Exception as e:
+                logger.exception("main_loop_error", error=str(e))
+                await asyncio.sleep(10)
+    finally:
+        await market_data.close()
+        await router.aclose()
 
-        except KeyboardInterrupt:
-            logger.info("agent_stopping_user_request")
-            break
-        except Exception as e:
-            logger.exception("main_loop_error", error=str(e))
-            await asyncio.sleep(10)
 
 if __name__ == "__main__":
+    logger.info("event_loop_selected", loop=install_event_loop_policy())
     try:
         asyncio.run(trading_loop())
     except KeyboardInterrupt:
@@ -8,11 +8,7 @@ from google import genai
 from pydantic import BaseModel, Field
 from typing import Any, Literal, Optional
 import structlog
-import os
-import sys
 
-# Import settings
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from agent_config import settings
 
 logger = structlog.get_logger()
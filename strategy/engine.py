@@ -460,11 +460,11 @@ class StrategyEngine:
             return []
 
         # Batch fetch prices
-        tasks = [self.market_data.get_current_price(sym) for sym, _, _ in symbols_to_check]
-        prices = await asyncio.gather(*tasks, return_exceptions=True)
+        prices = await self.market_data.get_current_prices([sym for sym, _, _ in symbols_to_check])
         
-        for (symbol, pos, rm), price_data in zip(symbols_to_check, prices):
-            if isinstance(price_data, Exception) or not price_data:
+        for symbol, pos, rm in symbols_to_check:
+            price_data = prices.get(symbol)
+            if not price_data:
                 continue
                 
             current_price = float(price_data.price)
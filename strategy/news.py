@@ -61,6 +61,13 @@ class NewsFetcher:
         # In-memory set of fingerprints seen THIS session (fast path)
         self._seen_fingerprints: set = set()
 
+    def _search(self, query: str, period: str) -> List[Dict]:
+        """Blocking GoogleNews search; runs on the executor."""
+        self.googlenews.clear()
+        self.googlenews.set_period(period)
+        self.googlenews.search(query)
+        return self.googlenews.result()
+
     async def get_news(self, query: str, period: str = '1d',
                        dedup_symbol: Optional[str] = None) -> List[NewsItem]:
         """Fetches news for a query. Optionally dedup against seen headlines.
@@ -84,14 +91,7 @@ class NewsFetcher:
                         return cached
 
             loop = asyncio.get_running_loop()
-            
-            def fetch():
-                self.googlenews.clear()
-                self.googlenews.set_period(period)
-                self.googlenews.search(query)
-                return self.googlenews.result()
-
-            results = await loop.run_in_executor(self._executor, fetch)
+            results = await loop.run_in_executor(self._executor, self._search, query, period)
             
             news_items = []
             for item in results:
@@ -4,9 +4,6 @@ import structlog
 from typing import Dict, Optional
 from datetime import datetime, date
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from agent_config import settings
 
 logger = structlog.get_logger()
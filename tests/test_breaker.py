@@ -0,0 +1,118 @@
+"""
+CircuitBreaker tests: opening, cool-down, the single trial call, and which
+errors count toward opening the circuit.
+"""
+
+import asyncio
+
+import pytest
+
+from trader import breaker
+from trader.breaker import CircuitBreaker, CircuitOpenError, is_transient
+from trader.india.kite_client import KiteAPIError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(breaker.time, "monotonic", clock)
+    return clock
+
+
+async def _ok():
+    return "ok"
+
+
+async def _raise(exc):
+    raise exc
+
+
+def _fail(cb, exc, times=1):
+    for _ in range(times):
+        with pytest.raises(type(exc)):
+            asyncio.run(cb.call(_raise, exc))
+
+
+def test_transient_failures_open_the_circuit(clock):
+    cb = CircuitBreaker("test", failure_threshold=3, reset_timeout=5.0)
+    _fail(cb, ConnectionResetError("reset"), times=3)
+
+    assert cb.is_open
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(cb.call(_ok))
+
+
+def test_timeouts_count_as_failures(clock):
+    cb = CircuitBreaker("test", failure_threshold=1, call_timeout=0.01)
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(cb.call(slow))
+    assert cb.is_open
+
+
+def test_answered_errors_do_not_count(clock):
+    cb = CircuitBreaker("test", failure_threshold=2)
+    _fail(cb, KeyError("BADSYMBOL"), times=3)
+    _fail(cb, ValueError("invalid quantity"), times=3)
+    _fail(cb, KiteAPIError("Invalid token", error_type="TokenException", http_status=403), times=3)
+
+    assert cb.fail_count == 0
+    assert asyncio.run(cb.call(_ok)) == "ok"
+
+
+def test_rate_limit_and_server_errors_count():
+    assert is_transient(KiteAPIError("Too many requests", http_status=429))
+    assert is_transient(KiteAPIError("Bad gateway", http_status=502))
+    assert not is_transient(KiteAPIError("Invalid input", http_status=400))
+
+
+def test_success_after_cool_down_closes_the_circuit(clock):
+    cb = CircuitBreaker("test", failure_threshold=2, reset_timeout=5.0)
+    _fail(cb, ConnectionResetError("reset"), times=2)
+
+    clock.now += 5.0
+    assert asyncio.run(cb.call(_ok)) == "ok"
+    assert cb.fail_count == 0 and not cb.is_open
+
+
+def test_failed_trial_reopens_the_circuit(clock):
+    cb = CircuitBreaker("test", failure_threshold=2, reset_timeout=5.0)
+    _fail(cb, ConnectionResetError("reset"), times=2)
+
+    clock.now += 5.0
+    _fail(cb, ConnectionResetError("still down"))
+    assert cb.is_open
+
+
+def test_only_one_trial_call_after_cool_down(clock):
+    cb = CircuitBreaker("test", failure_threshold=1, reset_timeout=5.0)
+    _fail(cb, ConnectionResetError("reset"))
+    clock.now += 5.0
+
+    async def run():
+        release = asyncio.Event()
+
+        async def trial():
+            await release.wait()
+            return "ok"
+
+        first = asyncio.ensure_future(cb.call(trial))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenError):
+            await cb.call(_ok)
+        release.set()
+        return await first
+
+    assert asyncio.run(run()) == "ok"
+    assert asyncio.run(cb.call(_ok)) == "ok"
@@ -0,0 +1,149 @@
+"""
+ZerodhaTrader tests against a fake Kite client (no network, no kiteconnect).
+"""
+
+import asyncio
+import sys
+import types
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+from agent_config import settings
+from trader.base import BrokerError
+from trader.india import zerodha
+from trader.india.zerodha import ZerodhaTrader, _KiteTickStore
+
+
+class FakeKite:
+    """Stands in for KiteClient; `quotes` maps instrument -> quote payload."""
+
+    def __init__(self, quotes=None):
+        self.quotes = quotes
+        self.quote_calls = []
+
+    async def quote(self, *instruments):
+        self.quote_calls.append(instruments)
+        return self.quotes
+
+    async def instruments(self, exchange):
+        raise ConnectionError("offline")
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def live_kite(monkeypatch, tmp_path):
+    """Builds a live-mode ZerodhaTrader whose REST client is a FakeKite."""
+    sdk = types.ModuleType("kiteconnect")
+    sdk.KiteConnect = MagicMock()
+    monkeypatch.setitem(sys.modules, "kiteconnect", sdk)
+    monkeypatch.setattr(settings, "trading_mode", "live")
+    monkeypatch.setattr(settings, "kite_access_token", "token")
+    monkeypatch.setattr(settings, "kite_stream_quotes", False)
+    monkeypatch.setattr(settings, "quote_cache_ttl_seconds", 0)
+    monkeypatch.setattr(settings, "market_data_cache_dir", str(tmp_path))
+
+    def build(quotes):
+        trader = ZerodhaTrader()
+        trader._api = FakeKite(quotes)
+        trader._tokens._api = trader._api
+        return trader
+
+    return build
+
+
+async def _quotes(trader, *symbols):
+    return await asyncio.wait_for(
+        asyncio.gather(*(trader.get_quote(s) for s in symbols), return_exceptions=True), timeout=2
+    )
+
+
+class FakeTokens:
+    def __init__(self, tokens):
+        self._tokens = tokens
+
+    def get(self, exchange_symbol):
+        return self._tokens.get(exchange_symbol)
+
+
+def test_tick_store_serves_fresh_ticks(monkeypatch):
+    store = _KiteTickStore(api=MagicMock(), tokens=FakeTokens({"NSE:INFY": 408065}))
+    monkeypatch.setattr(zerodha.time, "monotonic", lambda: 100.0)
+    store._on_ticks(None, [{"instrument_token": 408065, "last_price": 1500.5}])
+
+    assert store.last_price("NSE:INFY") == Decimal("1500.5")
+
+
+def test_tick_store_ignores_stale_ticks(monkeypatch):
+    monkeypatch.setattr(settings, "kite_tick_max_age_seconds", 30.0)
+    store = _KiteTickStore(api=MagicMock(), tokens=FakeTokens({"NSE:INFY": 408065}))
+    monkeypatch.setattr(zerodha.time, "monotonic", lambda: 100.0)
+    store._on_ticks(None, [{"instrument_token": 408065, "last_price": 1500.5}])
+
+    monkeypatch.setattr(zerodha.time, "monotonic", lambda: 131.0)
+    assert store.last_price("NSE:INFY") is None
+
+
+def test_tick_store_drops_ticks_when_socket_closes():
+    store = _KiteTickStore(api=MagicMock(), tokens=FakeTokens({"NSE:INFY": 408065}))
+    store._on_ticks(None, [{"instrument_token": 408065, "last_price": 1500.5}])
+
+    store._on_close(None, 1006, "connection lost")
+    assert store.last_price("NSE:INFY") is None
+
+    store._on_ticks(None, [{"instrument_token": 408065, "last_price": 1501}])
+    store._on_error(None, 1006, "boom")
+    assert store.last_price("NSE:INFY") is None
+
+
+def test_concurrent_quotes_share_one_request(live_kite):
+    trader = live_kite({
+        "NSE:INFY": {"last_price": Decimal("1500.5")},
+        "NSE:TCS": {"last_price": Decimal("3900")},
+    })
+    infy, tcs = asyncio.run(_quotes(trader, "INFY.NS", "TCS.NS"))
+
+    assert (infy, tcs) == (Decimal("1500.5"), Decimal("3900"))
+    assert len(trader._api.quote_calls) == 1
+    assert sorted(trader._api.quote_calls[0]) == ["NSE:INFY", "NSE:TCS"]
+
+
+def test_partial_quote_reply_fails_only_missing_symbols(live_kite):
+    trader = live_kite({"NSE:INFY": {"last_price": Decimal("1500.5")}})
+    infy, tcs = asyncio.run(_quotes(trader, "INFY.NS", "TCS.NS"))
+
+    assert infy == Decimal("1500.5")
+    assert isinstance(tcs, BrokerError)
+
+
+def test_malformed_quote_reply_resolves_every_waiter(live_kite):
+    trader = live_kite({
+        "NSE:INFY": {"last_price": None},
+        "NSE:TCS": {"last_price": Decimal("3900")},
+    })
+    infy, tcs = asyncio.run(_quotes(trader, "INFY.NS", "TCS.NS"))
+
+    assert isinstance(infy, BrokerError)
+    assert tcs == Decimal("3900")
+
+    trader = live_kite(None)  # "data" missing from the response
+    results = asyncio.run(_quotes(trader, "INFY.NS", "TCS.NS"))
+    assert all(isinstance(r, BrokerError) for r in results)
+
+
+def test_aclose_during_batch_window_fails_waiters(live_kite):
+    trader = live_kite({"NSE:INFY": {"last_price": Decimal("1500.5")}})
+
+    async def run():
+        task = asyncio.ensure_future(trader.get_quote("INFY.NS"))
+        while trader._quote_flush is None:
+            await asyncio.sleep(0)
+        await trader.aclose()
+        return await asyncio.wait_for(asyncio.gather(task, return_exceptions=True), timeout=2)
+
+    (result,) = asyncio.run(run())
+    assert isinstance(result, BrokerError)
+    assert trader._api.quote_calls == []
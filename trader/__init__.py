@@ -0,0 +1,28 @@
+import asyncio
+import atexit
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# One pool for every blocking broker / market-data SDK call in the process,
+# so an idle worker from one broker can serve another broker's burst.
+SHARED_IO_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="broker-io")
+# At exit, drop queued calls instead of running them against a closing process
+atexit.register(SHARED_IO_POOL.shutdown, wait=False, cancel_futures=True)
+
+
+def install_event_loop_policy() -> str:
+    """
+    Switches asyncio to uvloop (winloop on Windows) when it is installed.
+
+    Call once at a process entrypoint, before `asyncio.run()`. Falls back to
+    the stdlib loop if neither is available. Returns the loop module in use.
+    """
+    try:
+        if sys.platform == "win32":
+            import winloop as loop_impl
+        else:
+            import uvloop as loop_impl
+    except ImportError:
+        return "asyncio"
+    asyncio.set_event_loop_policy(loop_impl.EventLoopPolicy())
+    return loop_impl.__name__
@@ -1,10 +1,60 @@
+import asyncio
+import itertools
+import os
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, List, Optional, Sequence
 from decimal import Decimal
 from pydantic import BaseModel
 from datetime import datetime
 
-class Position(BaseModel):
+
+class BrokerError(Exception):
+    """
+    A broker read that failed (after retries) or returned no usable data.
+
+    Raised instead of answering with a placeholder such as `Decimal("0.00")`,
+    so callers can back off rather than act on a phantom price or balance.
+    """
+
+
+def to_decimal(value: Any) -> Decimal:
+    """
+    Converts a broker API value to Decimal with the fewest allocations.
+
+    Numeric strings (what most broker JSON carries) and Decimals go straight
+    in, ints convert exactly. Floats go through str() so that e.g. 0.1
+    becomes Decimal("0.1") rather than its binary expansion.
+    """
+    if isinstance(value, str):
+        return Decimal(value)
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    return Decimal(str(value))
+
+
+def paper_order_ids(prefix: str) -> Iterator[str]:
+    """
+    Yields unique paper-trading order ids: "<prefix>_<pid>_<start>_<n>".
+
+    The pid and start time keep ids distinct across runs (in a container
+    the pid is often 1 every time); the counter keeps them distinct within
+    a run without reading the clock per order.
+    """
+    run = f"{os.getpid()}_{int(time.time())}"
+    return (f"{prefix}_{run}_{n}" for n in itertools.count(1))
+
+
+@dataclass(slots=True, frozen=True)
+class Position:
+    """
+    A broker position. Every broker builds these from values it has already
+    parsed with `to_decimal`, so it is a slotted dataclass rather than a
+    validating model: one is allocated per holding on every refresh.
+    """
     symbol: str
     quantity: Decimal
     average_price: Decimal
@@ -21,6 +71,21 @@ class Order(BaseModel):
     status: str
     timestamp: datetime
 
+class OrderSpec(BaseModel):
+    """One order in a batch passed to `place_orders()`."""
+    symbol: str
+    quantity: Decimal
+    side: str  # buy, sell
+    order_type: str = "market"
+    price: Optional[Decimal] = None
+
+@dataclass(slots=True, frozen=True)
+class BrokerSnapshot:
+    """Account state and quotes read together by `Broker.snapshot()`."""
+    balance: Decimal
+    positions: Dict[str, Position]
+    quotes: Dict[str, Decimal]  # symbols whose quote failed are omitted
+
 class Broker(ABC):
     """Abstract base class for all broker implementations."""
 
@@ -41,7 +106,7 @@ class Broker(ABC):
 
     @abstractmethod
     async def get_quote(self, symbol: str) -> Decimal:
-        """Fetches the current price of a symbol."""
+        """Fetches the current price of a symbol. Raises `BrokerError` if it cannot be read."""
         pass
 
     @abstractmethod
@@ -51,7 +116,7 @@ class Broker(ABC):
 
     @abstractmethod
     async def get_account_balance(self) -> Decimal:
-        """Returns the available cash balance."""
+        """Returns the available cash balance. Raises `BrokerError` if it cannot be read."""
         pass
 
     @abstractmethod
@@ -59,7 +124,48 @@ class Broker(ABC):
         """Places a buy or sell order."""
         pass
     
+    async def snapshot(self, symbols: Sequence[str] = ()) -> BrokerSnapshot:
+        """
+        Reads balance, positions and quotes for `symbols` concurrently.
+
+        The reads are independent, so they overlap into about one round
+        trip instead of N + 2 sequential ones (and per-symbol quotes can
+        share a broker's batched quote request). A failed balance or
+        positions read raises; a failed quote just leaves its symbol out.
+        """
+        balance, positions, *prices = await asyncio.gather(
+            self.get_account_balance(),
+            self.get_positions(),
+            *(self.get_quote(symbol) for symbol in symbols),
+            return_exceptions=True,
+        )
+        for result in (balance, positions):
+            if isinstance(result, BaseException):
+                raise result
+        quotes = {
+            symbol: price for symbol, price in zip(symbols, prices)
+            if not isinstance(price, BaseException)
+        }
+        return BrokerSnapshot(balance=balance, positions=positions, quotes=quotes)
+
+    async def place_orders(self, specs: List[OrderSpec]) -> List[Order]:
+        """
+        Places several orders concurrently; results are in `specs` order.
+
+        Neither Kite nor Robinhood has a bulk order-placement endpoint, so
+        the default submits every order at once and waits for all ACKs:
+        one round trip of latency for the batch instead of one per order.
+        """
+        return list(await asyncio.gather(*(
+            self.place_order(s.symbol, s.quantity, s.side, order_type=s.order_type, price=s.price)
+            for s in specs
+        )))
+
     @abstractmethod
     async def get_option_chain(self, symbol: str) -> Any:
         # TODO: Define a standard OptionChain model
         pass
+
+    async def aclose(self) -> None:
+        """Releases network resources (HTTP sessions, sockets) held by the broker."""
+        pass
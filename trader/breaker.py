@@ -0,0 +1,112 @@
+"""
+Circuit breaker for broker API calls.
+
+A stalled broker endpoint would otherwise hold every awaiting coroutine
+(and any `asyncio.gather` it is part of) for the full HTTP timeout. The
+breaker bounds each call with a short timeout and, after repeated
+failures, fails fast for a cool-down period instead of queueing more
+requests behind a broker that is not answering.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
+
+import aiohttp
+import structlog
+
+from agent_config import settings
+
+logger = structlog.get_logger()
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the broker while its circuit is open."""
+
+
+def is_transient(exc: BaseException) -> bool:
+    """
+    True for failures that say the broker is unreachable or overloaded.
+
+    Timeouts, dropped connections and HTTP 429 / 5xx count; anything the
+    broker actually answered (bad symbol, invalid input, expired token)
+    does not, so a run of bad requests cannot open the circuit.
+    """
+    status = getattr(exc, "http_status", None) or getattr(exc, "status", None)
+    response = getattr(exc, "response", None)
+    if status is None and response is not None:
+        # requests.HTTPError (robin_stocks) carries the status on its response
+        status = getattr(response, "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    # OSError covers socket errors and requests' ConnectionError / Timeout
+    return isinstance(exc, (asyncio.TimeoutError, OSError, aiohttp.ClientConnectionError))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    - Each call is bounded by `call_timeout` seconds
+    - `failure_threshold` consecutive transient failures (`is_transient`)
+      open the circuit; other errors are re-raised without counting
+    - While open, calls raise `CircuitOpenError` for `reset_timeout` seconds
+    - After the cool-down a single trial call is let through while other
+      callers keep failing fast; its success closes the circuit, a
+      transient failure re-opens it
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3,
+                 reset_timeout: float = 5.0, call_timeout: float = 2.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.call_timeout = call_timeout
+        self.fail_count = 0
+        self.opened_until = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return time.monotonic() < self.opened_until
+
+    def record_success(self) -> None:
+        self.fail_count = 0
+        self.opened_until = 0.0
+
+    def record_failure(self) -> None:
+        self.fail_count += 1
+        if self.fail_count >= self.failure_threshold:
+            self.opened_until = time.monotonic() + self.reset_timeout
+            logger.warning("broker_circuit_opened", broker=self.name,
+                           failures=self.fail_count, cooldown=self.reset_timeout)
+
+    async def call(self, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """Awaits `fn(*args, **kwargs)` under the breaker's timeout."""
+        trial = False
+        if self.fail_count >= self.failure_threshold:
+            if self.is_open or self._trial_in_flight:
+                raise CircuitOpenError(f"{self.name} circuit open")
+            # Cool-down over: probe the broker with exactly one call
+            self._trial_in_flight = trial = True
+        try:
+            result = await asyncio.wait_for(fn(*args, **kwargs), timeout=self.call_timeout)
+        except Exception as e:
+            if is_transient(e):
+                self.record_failure()
+            raise
+        finally:
+            if trial:
+                self._trial_in_flight = False
+        self.record_success()
+        return result
+
+
+def broker_breaker(name: str) -> CircuitBreaker:
+    """Creates a breaker for a broker using the configured timeout and thresholds."""
+    return CircuitBreaker(
+        name,
+        failure_threshold=settings.broker_breaker_failure_threshold,
+        reset_timeout=settings.broker_breaker_reset_seconds,
+        call_timeout=settings.broker_call_timeout_seconds,
+    )
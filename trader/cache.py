@@ -0,0 +1,134 @@
+"""
+Small caches for the trader layer.
+
+Broker and market-data calls are network round trips; within a short window
+their answers are indistinguishable, so callers keep a bounded TTL cache in
+front of them. `FileCache` backs that with JSON files so separate processes
+(agent, dashboard, backtests) can reuse each other's market data, and
+`SingleFlight` makes concurrent callers share one in-flight request.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Bounded in-memory cache with per-entry expiry.
+
+    - TTL: default for every entry, overridable per `put()`
+    - Max entries: LRU eviction when full
+    - Uses the monotonic clock, so wall-clock adjustments never extend an entry
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 1.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_MISSING = object()
+
+
+class FileCache:
+    """
+    JSON file cache shared across processes.
+
+    - Layout: `<root>/<namespace>/<md5 of key>.json`
+    - Each file stores `{"ts": <unix time>, "value": <JSON value>}`
+    - Entries older than the caller's TTL are treated as missing
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, namespace: str, key: Hashable) -> str:
+        digest = hashlib.md5(repr(key).encode()).hexdigest()
+        return os.path.join(self.root, namespace, f"{digest}.json")
+
+    def get(self, namespace: str, key: Hashable, ttl: float) -> Any:
+        try:
+            with open(self._path(namespace, key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("ts", 0) >= ttl:
+            return None
+        return entry.get("value")
+
+    def put(self, namespace: str, key: Hashable, value: Any) -> None:
+        path = self._path(namespace, key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"ts": time.time(), "value": value}, f)
+            # Atomic swap so concurrent readers never see a partial file
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            # A cache write failure must never fail the fetch itself
+            pass
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one request.
+
+    The first caller for a key starts the call; callers arriving while it is
+    in flight await the same result. Once it finishes the key is released,
+    so later calls go to the network again (pair with a TTLCache for reuse).
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(fn(*args, **kwargs))
+            self._inflight[key] = fut
+            fut.add_done_callback(lambda f: self._release(key, f))
+        # Shield so one cancelled waiter does not cancel the call for everyone
+        return await asyncio.shield(fut)
+
+    def _release(self, key: Hashable, fut: asyncio.Future) -> None:
+        if self._inflight.get(key) is fut:
+            del self._inflight[key]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._inflight
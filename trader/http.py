@@ -0,0 +1,82 @@
+"""
+Shared HTTP plumbing for the trader layer.
+
+Every REST client (broker APIs, market data) creates its session through
+`create_session()` so connection pooling and timeouts are configured in
+one place. A session is meant to live as long as the client that owns
+it: reusing it keeps TCP + TLS connections warm across calls instead of
+paying a fresh handshake per request.
+"""
+
+import asyncio
+import json
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import aiohttp
+
+try:
+    import orjson
+    # orjson parses bytes directly and is several times faster than stdlib json
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+DEFAULT_TIMEOUT_SECONDS = 5.0
+# Keep idle connections open between poll cycles (aiohttp's default is 15s)
+KEEPALIVE_TIMEOUT_SECONDS = 75.0
+DNS_CACHE_SECONDS = 300
+
+# Rate limiting and gateway errors are worth retrying; anything else is not
+RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY_SECONDS = 0.05
+
+
+def create_session(limit: int = 20, limit_per_host: int = 10,
+                   timeout: float = DEFAULT_TIMEOUT_SECONDS,
+                   headers: Optional[Dict[str, str]] = None) -> aiohttp.ClientSession:
+    """
+    Creates a pooled aiohttp session.
+
+    Must be called from inside a running event loop — clients create their
+    session lazily on first use rather than in `__init__`.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=KEEPALIVE_TIMEOUT_SECONDS,
+        ttl_dns_cache=DNS_CACHE_SECONDS,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        headers=headers,
+    )
+
+
+async def request_json(session: aiohttp.ClientSession, method: str, url: str, *,
+                       retry: bool = False, loads: Callable[[Any], Any] = json_loads,
+                       **kwargs: Any) -> Tuple[int, Any]:
+    """
+    Sends a request and returns `(status, decoded JSON body)`.
+
+    With `retry`, a 429/5xx gateway response or a dropped connection is
+    retried up to `RETRY_ATTEMPTS` times with exponential backoff on the
+    same session, so the retry reuses a pooled connection instead of a new
+    handshake. Only pass `retry=True` for idempotent calls (never orders).
+    """
+    delay = RETRY_BASE_DELAY_SECONDS
+    for _ in range(RETRY_ATTEMPTS - 1 if retry else 0):
+        try:
+            async with session.request(method, url, **kwargs) as resp:
+                if resp.status not in RETRYABLE_STATUSES:
+                    return resp.status, await resp.json(content_type=None, loads=loads)
+                # Drain the body so the connection goes back to the pool
+                await resp.read()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            pass
+        await asyncio.sleep(delay)
+        delay *= 2
+    async with session.request(method, url, **kwargs) as resp:
+        # APIs do not always set a JSON content type
+        return resp.status, await resp.json(content_type=None, loads=loads)
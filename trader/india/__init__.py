@@ -1,4 +1,13 @@
-from .zerodha import ZerodhaTrader
-from .icici import ICICITrader
-
 __all__ = ["ZerodhaTrader", "ICICITrader"]
+
+
+def __getattr__(name):
+    # Import brokers on first access so using one does not pull in the
+    # other's SDK (e.g. importing ICICI must not import kiteconnect).
+    if name == "ZerodhaTrader":
+        from .zerodha import ZerodhaTrader
+        return ZerodhaTrader
+    if name == "ICICITrader":
+        from .icici import ICICITrader
+        return ICICITrader
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,6 +8,7 @@ Each concrete Indian broker overrides `get_exchange_symbol()` to produce the
 format its specific API expects (e.g. "NSE:RELIANCE" for Kite, "RELIANCE" for Breeze).
 """
 
+import functools
 from abc import ABC
 from trader.base import Broker
 
@@ -28,7 +29,10 @@ class IndiaBroker(Broker, ABC):
     CURRENCY = "INR"
     EXCHANGES = ["NSE", "BSE"]
 
+    # Symbol helpers run on every quote/order for a small, fixed set of
+    # tickers, so their results are memoized.
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def normalize_symbol(symbol: str) -> str:
         """
         Strips exchange suffixes to get a clean Indian stock code.
@@ -41,6 +45,7 @@ class IndiaBroker(Broker, ABC):
         return symbol.upper().replace(".NS", "").replace(".BO", "").strip()
 
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def detect_exchange(symbol: str) -> str:
         """
         Detects the exchange from the symbol suffix.
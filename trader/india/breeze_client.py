@@ -0,0 +1,94 @@
+"""
+Async client for the ICICI Direct Breeze REST API.
+
+The official `breeze-connect` SDK is synchronous and issues every call
+through a fresh `requests` connection. This client covers only the
+endpoints the agent uses (quotes, positions, funds, orders) and sends
+them over one pooled aiohttp session, so the TCP + TLS setup is paid once
+per process rather than once per call.
+
+Request signing follows the SDK: each JSON body is signed with
+SHA-256(timestamp + body + secret_key) and sent as `X-Checksum`.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from ..http import create_session, request_json
+
+
+class BreezeClient:
+    """Minimal async Breeze API client holding a persistent HTTP session."""
+
+    BASE_URL = "https://api.icicidirect.com/breezeapi/api/v1/"
+
+    def __init__(self, api_key: str, secret_key: Optional[str] = None):
+        self.api_key = api_key
+        self.secret_key = secret_key or ""
+        self.session_token: Optional[str] = None
+        self._client: Optional[aiohttp.ClientSession] = None
+
+    def _session(self) -> aiohttp.ClientSession:
+        if self._client is None or self._client.closed:
+            self._client = create_session()
+        return self._client
+
+    async def _request(self, method: str, endpoint: str, body: str, headers: Dict[str, str]) -> Dict[str, Any]:
+        # Breeze sends reads as GET-with-body; those are retried on 429/5xx
+        _, payload = await request_json(self._session(), method, self.BASE_URL + endpoint,
+                                        retry=method == "GET", data=body, headers=headers)
+        return payload
+
+    def _signed_headers(self, body: str) -> Dict[str, str]:
+        timestamp = datetime.now(timezone.utc).isoformat()[:19] + ".000Z"
+        checksum = hashlib.sha256((timestamp + body + self.secret_key).encode("utf-8")).hexdigest()
+        return {
+            "Content-Type": "application/json",
+            "X-Checksum": f"token {checksum}",
+            "X-Timestamp": timestamp,
+            "X-AppKey": self.api_key,
+            "X-SessionToken": self.session_token or "",
+        }
+
+    async def _call(self, method: str, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        body = json.dumps(payload, separators=(",", ":"))
+        return await self._request(method, endpoint, body, self._signed_headers(body))
+
+    async def generate_session(self, session_token: str) -> None:
+        """Exchanges the login session token for the API session token used to sign calls."""
+        body = json.dumps({"SessionToken": session_token, "AppKey": self.api_key}, separators=(",", ":"))
+        data = await self._request("GET", "customerdetails", body, {"Content-Type": "application/json"})
+        success = data.get("Success") if data else None
+        if not success or not success.get("session_token"):
+            raise RuntimeError(f"Breeze customerdetails failed: {data.get('Error') if data else data}")
+        self.session_token = success["session_token"]
+
+    async def get_quotes(self, stock_code: str, exchange_code: str, expiry_date: str = "",
+                         product_type: str = "cash", right: str = "", strike_price: str = "") -> Dict[str, Any]:
+        return await self._call("GET", "quotes", {
+            "stock_code": stock_code,
+            "exchange_code": exchange_code,
+            "expiry_date": expiry_date,
+            "product_type": product_type,
+            "right": right,
+            "strike_price": strike_price,
+        })
+
+    async def get_portfolio_positions(self) -> Dict[str, Any]:
+        return await self._call("GET", "portfoliopositions", {})
+
+    async def get_funds(self) -> Dict[str, Any]:
+        return await self._call("GET", "funds", {})
+
+    async def place_order(self, **order: Any) -> Dict[str, Any]:
+        return await self._call("POST", "order", order)
+
+    async def aclose(self) -> None:
+        """Closes the underlying HTTP session."""
+        if self._client is not None and not self._client.closed:
+            await self._client.close()
+        self._client = None
@@ -2,13 +2,17 @@ import structlog
 from decimal import Decimal
 from typing import Dict, Any, Optional
 from datetime import datetime
-# from breeze_connect import BreezeConnect # Lazy load
 from agent_config import settings
 from .base import IndiaBroker
-from ..base import Order, Position
+from .breeze_client import BreezeClient
+from ..base import BrokerError, Order, Position, to_decimal
+from ..breaker import broker_breaker
+from ..cache import TTLCache
 
 logger = structlog.get_logger()
 
+_D0 = Decimal(0)
+
 class ICICITrader(IndiaBroker):
     """
     ICICI Direct / Breeze broker — Indian market.
@@ -19,14 +23,16 @@ class ICICITrader(IndiaBroker):
     def __init__(self):
         self.breeze = None
         if settings.icici_api_key:
-            try:
-                from breeze_connect import BreezeConnect
-                self.breeze = BreezeConnect(api_key=settings.icici_api_key)
-            except Exception as e:
-                logger.error("icici_init_failed", error=str(e))
+            self.breeze = BreezeClient(api_key=settings.icici_api_key, secret_key=settings.icici_secret_key)
         self.is_authenticated = False
         self.session_token = settings.icici_session_token
         self.secret_key = settings.icici_secret_key
+        self._breaker = broker_breaker("icici")
+        self._quote_cache = None
+        if settings.quote_cache_ttl_seconds > 0:
+            self._quote_cache = TTLCache(maxsize=2048, ttl=settings.quote_cache_ttl_seconds)
+        # Account state only changes on fills; reuse it briefly, drop it after an order
+        self._account_cache = TTLCache(maxsize=2)
 
     def get_exchange_symbol(self, symbol: str) -> str:
         """
@@ -44,10 +50,7 @@ class ICICITrader(IndiaBroker):
             return False
 
         try:
-            self.breeze.generate_session(
-                api_secret=self.secret_key,
-                session_token=self.session_token
-            )
+            await self.breeze.generate_session(self.session_token)
             self.is_authenticated = True
             logger.info("icici_login_successful")
             return True
@@ -56,12 +59,18 @@ class ICICITrader(IndiaBroker):
             return False
 
     async def get_quote(self, symbol: str) -> Decimal:
-        if not self.is_authenticated: return Decimal(0)
+        if not self.is_authenticated:
+            raise BrokerError("ICICI session not authenticated")
+        if self._quote_cache is not None:
+            cached = self._quote_cache.get(symbol)
+            if cached is not None:
+                return cached
         try:
             exchange_symbol = self.get_exchange_symbol(symbol)
             exchange = self.detect_exchange(symbol)
             
-            data = self.breeze.get_quotes(
+            data = await self._breaker.call(
+                self.breeze.get_quotes,
                 stock_code=exchange_symbol,
                 exchange_code=exchange,
                 expiry_date="",
@@ -72,66 +81,83 @@ class ICICITrader(IndiaBroker):
             if data and 'Success' in data and data['Success']:
                  quotes = data['Success']
                  if quotes and len(quotes) > 0:
-                     return Decimal(str(quotes[0]['ltp']))
-            return Decimal(0)
+                     price = to_decimal(quotes[0]['ltp'])
+                     if self._quote_cache is not None:
+                         self._quote_cache.put(symbol, price)
+                     return price
         except Exception as e:
             logger.error("icici_get_quote_error", symbol=symbol, error=str(e))
-            return Decimal(0)
+            raise BrokerError(f"ICICI quote failed for {symbol}") from e
+        raise BrokerError(f"ICICI returned no quote for {symbol}")
 
     async def get_positions(self) -> Dict[str, Position]:
         if not self.is_authenticated: return {}
+        cached = self._account_cache.get("positions")
+        if cached is not None:
+            return dict(cached)
         try:
-            response = self.breeze.get_portfolio_positions()
+            response = await self._breaker.call(self.breeze.get_portfolio_positions)
             positions = {}
             if response and 'Success' in response and response['Success']:
                 for p in response['Success']:
                     symbol = p.get('stock_code', 'UNKNOWN')
-                    qty = Decimal(str(p.get('quantity', 0)))
-                    avg_price = Decimal(str(p.get('average_price', 0)))
+                    qty = to_decimal(p.get('quantity', 0))
+                    avg_price = to_decimal(p.get('average_price', 0))
                     
                     positions[symbol] = Position(
                         symbol=symbol,
                         quantity=qty,
                         average_price=avg_price,
                         current_price=avg_price,
-                        market_value=Decimal(0),
-                        unrealized_pnl=Decimal(0)
+                        market_value=_D0,
+                        unrealized_pnl=_D0
                     )
-            return positions
+                self._account_cache.put("positions", positions, ttl=settings.positions_cache_ttl_seconds)
+            return dict(positions)
         except Exception as e:
             logger.error("icici_get_positions_error", error=str(e))
             return {}
 
     async def get_account_balance(self) -> Decimal:
-        if not self.is_authenticated: return Decimal(0)
+        if not self.is_authenticated:
+            raise BrokerError("ICICI session not authenticated")
+        cached = self._account_cache.get("balance")
+        if cached is not None:
+            return cached
         try:
-            response = self.breeze.get_funds()
+            response = await self._breaker.call(self.breeze.get_funds)
             if response and 'Success' in response and response['Success']:
                 funds = response['Success']
-                return Decimal(str(funds.get('bank_balance', 0)))
-            return Decimal(0)
+                balance = to_decimal(funds.get('bank_balance', 0))
+                self._account_cache.put("balance", balance, ttl=settings.balance_cache_ttl_seconds)
+                return balance
         except Exception as e:
             logger.error("icici_get_balance_error", error=str(e))
-            return Decimal(0)
+            raise BrokerError("ICICI balance unavailable") from e
+        raise BrokerError("ICICI returned no funds")
 
     async def place_order(self, symbol: str, quantity: Decimal, side: str, order_type: str = "market", price: Optional[Decimal] = None) -> Order:
+        timestamp = datetime.now()
         if not self.is_authenticated:
-            return Order(order_id="N/A", symbol=symbol, side=side, quantity=quantity, status="REJECTED", timestamp=datetime.now())
+            return Order(order_id="N/A", symbol=symbol, side=side, quantity=quantity, status="REJECTED", timestamp=timestamp)
 
         try:
             exchange_symbol = self.get_exchange_symbol(symbol)
             exchange = self.detect_exchange(symbol)
             action = "buy" if side.lower() == "buy" else "sell"
+            # Breeze takes numeric fields as strings; "0" means no limit price
+            price_s = "0" if price is None else format(price, "f")
+            qty_s = format(int(quantity), "d")
             
-            response = self.breeze.place_order(
+            response = await self.breeze.place_order(
                 stock_code=exchange_symbol,
                 exchange_code=exchange,
                 product="cash",
                 action=action,
                 order_type=order_type,
                 stoploss="0",
-                quantity=str(int(quantity)),
-                price=str(price) if price else "0",
+                quantity=qty_s,
+                price=price_s,
                 validity="day"
             )
             
@@ -141,6 +167,7 @@ class ICICITrader(IndiaBroker):
             if response and 'Success' in response and response['Success']:
                 order_id = response['Success']['order_id']
                 status = "PENDING"
+                self._account_cache.clear()
                 logger.info("icici_order_placed", order_id=order_id, symbol=exchange_symbol, exchange=exchange)
             else:
                  logger.error("icici_order_failed", response=response)
@@ -152,11 +179,15 @@ class ICICITrader(IndiaBroker):
                 quantity=quantity,
                 price=price,
                 status=status,
-                timestamp=datetime.now()
+                timestamp=timestamp
             )
         except Exception as e:
             logger.error("icici_place_order_error", error=str(e))
-            return Order(order_id="ERROR", symbol=symbol, side=side, quantity=quantity, status="ERROR", timestamp=datetime.now())
+            return Order(order_id="ERROR", symbol=symbol, side=side, quantity=quantity, status="ERROR", timestamp=timestamp)
 
     async def get_option_chain(self, symbol: str) -> list:
         return []
+
+    async def aclose(self) -> None:
+        if self.breeze:
+            await self.breeze.aclose()
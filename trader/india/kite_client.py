@@ -0,0 +1,134 @@
+"""
+Async client for the Kite Connect v3 REST API.
+
+The official `kiteconnect` SDK is synchronous (`requests`), so every call
+had to hop through a thread pool. This client covers the endpoints the
+agent trades with (quotes, portfolio, margins, orders, instrument dumps)
+and sends them over one pooled aiohttp session.
+
+Login (`generate_session`) and the `KiteTicker` WebSocket still come from
+the SDK; this client only needs the resulting access token.
+"""
+
+import asyncio
+import csv
+import functools
+import io
+import json
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from ..base import BrokerError
+from ..http import create_session, request_json
+
+# Prices arrive as JSON numbers; parsing them straight to Decimal keeps the
+# exact wire value and skips a float -> str -> Decimal hop per field.
+_loads = functools.partial(json.loads, parse_float=Decimal)
+
+
+class KiteAPIError(BrokerError):
+    """Raised when Kite answers a request with `status: error`."""
+
+    def __init__(self, message: str, error_type: Optional[str] = None, http_status: Optional[int] = None):
+        super().__init__(message)
+        self.error_type = error_type
+        self.http_status = http_status
+
+
+def _parse_instruments(text: str) -> List[Dict[str, Any]]:
+    """Parses Kite's instrument CSV dump, converting the numeric columns."""
+    rows = []
+    for row in csv.DictReader(io.StringIO(text)):
+        row["instrument_token"] = int(row["instrument_token"])
+        row["exchange_token"] = int(row["exchange_token"])
+        row["last_price"] = float(row["last_price"] or 0)
+        row["strike"] = float(row["strike"] or 0)
+        row["tick_size"] = float(row["tick_size"] or 0)
+        row["lot_size"] = int(row["lot_size"] or 0)
+        rows.append(row)
+    return rows
+
+
+class KiteClient:
+    """Minimal async Kite Connect client holding a persistent HTTP session."""
+
+    BASE_URL = "https://api.kite.trade/"
+
+    # Same values as the SDK's constants, so callers need not import it
+    VARIETY_REGULAR = "regular"
+    PRODUCT_CNC = "CNC"
+    ORDER_TYPE_MARKET = "MARKET"
+    ORDER_TYPE_LIMIT = "LIMIT"
+    TRANSACTION_TYPE_BUY = "BUY"
+    TRANSACTION_TYPE_SELL = "SELL"
+    EXCHANGE_NSE = "NSE"
+    EXCHANGE_BSE = "BSE"
+
+    def __init__(self, api_key: str, access_token: Optional[str] = None):
+        self.api_key = api_key
+        self.access_token = access_token
+        self._client: Optional[aiohttp.ClientSession] = None
+
+    def set_access_token(self, access_token: str) -> None:
+        self.access_token = access_token
+
+    def _session(self) -> aiohttp.ClientSession:
+        if self._client is None or self._client.closed:
+            self._client = create_session(headers={"X-Kite-Version": "3"})
+        return self._client
+
+    def _auth_headers(self) -> Dict[str, str]:
+        return {"Authorization": f"token {self.api_key}:{self.access_token}"}
+
+    async def _request(self, method: str, endpoint: str, params: Any = None,
+                       data: Optional[Dict[str, Any]] = None) -> Any:
+        # Reads are retried on 429/5xx; an order POST is sent exactly once
+        status, payload = await request_json(
+            self._session(), method, self.BASE_URL + endpoint, retry=method == "GET",
+            loads=_loads, params=params, data=data, headers=self._auth_headers(),
+        )
+        if payload.get("status") == "error":
+            raise KiteAPIError(payload.get("message", "Kite request failed"),
+                               error_type=payload.get("error_type"), http_status=status)
+        return payload.get("data")
+
+    async def quote(self, *instruments: str) -> Dict[str, Any]:
+        """Full quotes for "EXCHANGE:SYMBOL" names or instrument tokens, keyed as requested."""
+        return await self._request("GET", "quote", params=[("i", i) for i in instruments])
+
+    async def ltp(self, *instruments: str) -> Dict[str, Any]:
+        """Last traded prices keyed by "EXCHANGE:SYMBOL"."""
+        return await self._request("GET", "quote/ltp", params=[("i", i) for i in instruments])
+
+    async def holdings(self) -> List[Dict[str, Any]]:
+        return await self._request("GET", "portfolio/holdings")
+
+    async def positions(self) -> Dict[str, Any]:
+        return await self._request("GET", "portfolio/positions")
+
+    async def margins(self) -> Dict[str, Any]:
+        return await self._request("GET", "user/margins")
+
+    async def place_order(self, variety: str, **params: Any) -> str:
+        """Places an order and returns its order id."""
+        # Form-encoded like the SDK; values go over the wire as strings
+        data = {k: str(v) for k, v in params.items() if v is not None}
+        result = await self._request("POST", f"orders/{variety}", data=data)
+        return result["order_id"]
+
+    async def instruments(self, exchange: str) -> List[Dict[str, Any]]:
+        """The exchange's full instrument list (a CSV dump, not JSON)."""
+        async with self._session().get(f"{self.BASE_URL}instruments/{exchange}",
+                                       headers=self._auth_headers()) as resp:
+            resp.raise_for_status()
+            text = await resp.text()
+        # Dumps run to tens of thousands of rows; parse off the event loop
+        return await asyncio.get_running_loop().run_in_executor(None, _parse_instruments, text)
+
+    async def aclose(self) -> None:
+        """Closes the underlying HTTP session."""
+        if self._client is not None and not self._client.closed:
+            await self._client.close()
+        self._client = None
@@ -1,20 +1,205 @@
-from kiteconnect import KiteConnect
 from decimal import Decimal
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Set
+from datetime import date, datetime
 import structlog
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
 
 from .base import IndiaBroker
-from ..base import Position, Order
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from .kite_client import KiteClient
+from ..base import BrokerError, Position, Order, paper_order_ids, to_decimal
+from ..breaker import broker_breaker
+from ..cache import FileCache, SingleFlight, TTLCache
 from agent_config import settings
 
 logger = structlog.get_logger()
 
+_ZERO = Decimal("0.00")
+# Kite's /quote accepts up to 500 instruments; quote requests arriving within
+# the window are sent together
+_QUOTE_BATCH_SIZE = 500
+_QUOTE_BATCH_WINDOW_SECONDS = 0.01
+# Option contracts live in the NFO dump; only these columns are kept
+_OPTION_SEGMENT = "NFO"
+_OPTION_TYPES = {"CE": "call", "PE": "put"}
+_OPTION_FIELDS = ("name", "expiry", "strike", "instrument_type", "last_price", "lot_size", "instrument_token")
+
+# underlying -> expiry (ISO date, ascending) -> contracts
+OptionIndex = Dict[str, Dict[str, List[Dict[str, Any]]]]
+
+
+def _index_options(rows: List[Dict[str, Any]]) -> OptionIndex:
+    """Groups option contracts by underlying, then by expiry in date order."""
+    grouped: OptionIndex = {}
+    for row in rows:
+        grouped.setdefault(row["name"], {}).setdefault(row["expiry"], []).append(row)
+    return {name: dict(sorted(expiries.items())) for name, expiries in grouped.items()}
+
+
+def _fail_unresolved(batch: Dict[str, asyncio.Future]) -> None:
+    for symbol, fut in batch.items():
+        if not fut.done():
+            fut.set_exception(BrokerError(f"Kite quote for {symbol} was not resolved"))
+
+
+class _InstrumentTokens:
+    """
+    "EXCHANGE:SYMBOL" -> Kite instrument token, loaded once per exchange.
+
+    Tokens come from the exchange's instrument dump, which is shared with
+    other processes through the file cache and refreshed once per
+    `kite_instruments_cache_ttl_seconds` (Kite regenerates dumps daily).
+    """
+
+    def __init__(self, api: KiteClient):
+        self._api = api
+        self._files = FileCache(settings.market_data_cache_dir)
+        self._tokens: Dict[str, int] = {}
+        self._loaded_exchanges: Set[str] = set()
+        self._loads = SingleFlight()
+        self._pending: Set[asyncio.Task] = set()
+
+    async def _load_exchange(self, exchange: str) -> None:
+        ttl = settings.kite_instruments_cache_ttl_seconds
+        loop = asyncio.get_running_loop()
+        tokens = None
+        if ttl > 0:
+            tokens = await loop.run_in_executor(None, self._files.get, "kite_tokens", exchange, ttl)
+        if tokens is None:
+            tokens = {inst["tradingsymbol"]: inst["instrument_token"] for inst in await self._api.instruments(exchange)}
+            if ttl > 0:
+                await loop.run_in_executor(None, self._files.put, "kite_tokens", exchange, tokens)
+        self._tokens.update((f"{exchange}:{symbol}", token) for symbol, token in tokens.items())
+        self._loaded_exchanges.add(exchange)
+
+    async def load(self, exchange: str) -> bool:
+        """Loads the exchange's tokens if needed; False if the dump could not be fetched."""
+        if exchange in self._loaded_exchanges:
+            return True
+        try:
+            await self._loads.do(exchange, self._load_exchange, exchange)
+        except Exception as e:
+            logger.warning("kite_instruments_failed", exchange=exchange, error=str(e))
+            return False
+        return True
+
+    def load_soon(self, exchange: str) -> None:
+        """Starts `load()` in the background unless the exchange is loaded or loading."""
+        if exchange in self._loaded_exchanges or exchange in self._loads:
+            return
+        task = asyncio.ensure_future(self.load(exchange))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def get(self, exchange_symbol: str) -> Optional[int]:
+        return self._tokens.get(exchange_symbol)
+
+    def close(self) -> None:
+        for task in self._pending:
+            task.cancel()
+
+
+class _KiteTickStore:
+    """
+    Last-traded prices pushed over Kite's WebSocket (`KiteTicker`, LTP mode).
+
+    Symbols are resolved to instrument tokens through `_InstrumentTokens`
+    and subscribed on first request. Ticks land in `_last_tick`, so a quote
+    for a subscribed symbol is a dict lookup instead of a REST round trip.
+    Until the first tick for a symbol arrives `last_price()` returns None
+    and the caller falls back to REST. The same happens once a tick is older
+    than `kite_tick_max_age_seconds`, and every tick is dropped when the
+    socket closes or errors, so a dead stream never serves stale prices.
+    """
+
+    def __init__(self, api: KiteClient, tokens: _InstrumentTokens):
+        self._api = api
+        self._tokens = tokens
+        self._subscribed: Set[int] = set()
+        self._last_tick: Dict[int, tuple[float, Decimal]] = {}  # token -> (monotonic time, price)
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._ticker = None
+
+    def start(self) -> None:
+        from kiteconnect import KiteTicker
+
+        ticker = KiteTicker(self._api.api_key, self._api.access_token)
+        ticker.on_ticks = self._on_ticks
+        ticker.on_connect = self._on_connect
+        ticker.on_close = self._on_close
+        ticker.on_error = self._on_error
+        # Runs the socket on its own thread; callbacks fire there
+        ticker.connect(threaded=True)
+        self._ticker = ticker
+
+    def _on_connect(self, ws, response) -> None:
+        # Re-subscribe everything on (re)connect
+        with self._lock:
+            tokens = list(self._subscribed)
+        if tokens:
+            ws.subscribe(tokens)
+            ws.set_mode(ws.MODE_LTP, tokens)
+
+    def _on_close(self, ws, code, reason) -> None:
+        # Prices stop updating while disconnected; quotes go to REST until ticks resume
+        self._last_tick.clear()
+
+    def _on_error(self, ws, code, reason) -> None:
+        logger.warning("kite_ticker_error", code=code, reason=reason)
+        self._last_tick.clear()
+
+    def _on_ticks(self, ws, ticks) -> None:
+        now = time.monotonic()
+        for tick in ticks:
+            self._last_tick[tick["instrument_token"]] = (now, to_decimal(tick["last_price"]))
+
+    async def subscribe(self, exchange_symbol: str) -> None:
+        """Resolves the symbol (loading its exchange's dump once) and adds it to the LTP subscription."""
+        if not await self._tokens.load(exchange_symbol.split(":", 1)[0]):
+            return
+        token = self._tokens.get(exchange_symbol)
+        if token is None:
+            return
+        with self._lock:
+            if token in self._subscribed:
+                return
+            self._subscribed.add(token)
+        ticker = self._ticker
+        if ticker is not None and ticker.is_connected():
+            ticker.subscribe([token])
+            ticker.set_mode(ticker.MODE_LTP, [token])
+
+    def subscribe_soon(self, exchange_symbol: str) -> None:
+        """Starts `subscribe()` in the background, once per symbol at a time."""
+        if exchange_symbol in self._pending:
+            return
+        task = asyncio.ensure_future(self.subscribe(exchange_symbol))
+        self._pending[exchange_symbol] = task
+        task.add_done_callback(lambda _: self._pending.pop(exchange_symbol, None))
+
+    def last_price(self, exchange_symbol: str) -> Optional[Decimal]:
+        token = self._tokens.get(exchange_symbol)
+        if token is None:
+            return None
+        tick = self._last_tick.get(token)
+        if tick is None or time.monotonic() - tick[0] > settings.kite_tick_max_age_seconds:
+            return None
+        return tick[1]
+
+    def is_subscribed(self, exchange_symbol: str) -> bool:
+        token = self._tokens.get(exchange_symbol)
+        return token is not None and token in self._subscribed
+
+    def close(self) -> None:
+        for task in self._pending.values():
+            task.cancel()
+        if self._ticker is not None:
+            self._ticker.close()
+            self._ticker = None
+
+
 class ZerodhaTrader(IndiaBroker):
     """
     Zerodha / Kite Connect broker — Indian market.
@@ -23,11 +208,49 @@ class ZerodhaTrader(IndiaBroker):
     """
 
     def __init__(self):
-        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending_orders: Set[asyncio.Task] = set()
+        self._breaker = broker_breaker("zerodha")
+        # Caps concurrent Kite calls; identical in-flight reads share one request
+        self._limit = asyncio.Semaphore(settings.broker_max_concurrency)
+        self._inflight = SingleFlight()
+        self._quote_cache = None
+        if settings.quote_cache_ttl_seconds > 0:
+            self._quote_cache = TTLCache(maxsize=2048, ttl=settings.quote_cache_ttl_seconds)
+        self._ticks: Optional[_KiteTickStore] = None
+        self._quote_batch: Dict[str, asyncio.Future] = {}
+        self._quote_flush: Optional[asyncio.Task] = None
+        self._symbol_map: Dict[str, str] = {}
+        # Account state only changes on fills; reuse it briefly, drop it after an order
+        self._account_cache = TTLCache(maxsize=2)
+        # Option chains are sliced from the NFO instrument dump, fetched at
+        # most once per TTL and shared across processes through the file cache
+        self._option_index = TTLCache(maxsize=1, ttl=settings.kite_instruments_cache_ttl_seconds)
+        self._instrument_files = FileCache(settings.market_data_cache_dir)
         self.is_paper = settings.trading_mode == "paper"
-        
-        if not self.is_paper:
+        if self.is_paper:
+            # Trading mode is fixed for the process: bind the paper paths once
+            # instead of branching on every call
+            self.get_quote = self._get_quote_paper
+            self.place_order = self._place_order_paper
+            self._paper_ids = paper_order_ids("paper_kite")
+        else:
+            # SDK for login only (imported here so paper mode never loads it);
+            # API calls go through the async REST client
+            from kiteconnect import KiteConnect
+
             self.kite = KiteConnect(api_key=settings.kite_api_key)
+            self._api = KiteClient(settings.kite_api_key)
+
+            # Resolve Kite enum constants once instead of on every order
+            k = KiteClient
+            self._txn_types = {"buy": k.TRANSACTION_TYPE_BUY, "sell": k.TRANSACTION_TYPE_SELL}
+            self._txn_sell = k.TRANSACTION_TYPE_SELL
+            self._order_types = {"market": k.ORDER_TYPE_MARKET, "limit": k.ORDER_TYPE_LIMIT}
+            self._exchanges = {"NSE": k.EXCHANGE_NSE, "BSE": k.EXCHANGE_BSE}
+            self._variety = k.VARIETY_REGULAR
+            self._product = k.PRODUCT_CNC
+            # Quotes and the ticker address instruments by integer token
+            self._tokens = _InstrumentTokens(self._api)
             
             try:
                 if settings.kite_access_token:
@@ -43,6 +266,15 @@ class ZerodhaTrader(IndiaBroker):
                     logger.warning("kite_missing_credentials_for_login")
             except Exception as e:
                 logger.error("kite_login_failed", error=str(e))
+            self._api.set_access_token(self.kite.access_token)
+
+            if settings.kite_stream_quotes and self.kite.access_token:
+                try:
+                    ticks = _KiteTickStore(self._api, self._tokens)
+                    ticks.start()
+                    self._ticks = ticks
+                except Exception as e:
+                    logger.warning("kite_ticker_unavailable", error=str(e))
 
     def get_exchange_symbol(self, symbol: str) -> str:
         """
@@ -53,9 +285,16 @@ class ZerodhaTrader(IndiaBroker):
             "TCS.BO"      -> "BSE:TCS"
             "INFY"        -> "NSE:INFY"
         """
-        clean = self.normalize_symbol(symbol)
-        exchange = self.detect_exchange(symbol)
-        return f"{exchange}:{clean}"
+        exchange_symbol = self._symbol_map.get(symbol)
+        if exchange_symbol is None:
+            exchange_symbol = f"{self.detect_exchange(symbol)}:{self.normalize_symbol(symbol)}"
+            self._symbol_map[symbol] = exchange_symbol
+        return exchange_symbol
+
+    async def _call_kite(self, fn, *args: Any) -> Any:
+        """Awaits a Kite REST call under the concurrency cap and breaker."""
+        async with self._limit:
+            return await self._breaker.call(fn, *args)
 
     async def authenticate(self) -> bool:
         if self.is_paper:
@@ -63,45 +302,119 @@ class ZerodhaTrader(IndiaBroker):
             return True
         return True
 
+    async def _get_quote_paper(self, symbol: str) -> Decimal:
+        try:
+            import yfinance as yf
+            # yfinance needs suffixes .NS or .BO, symbol might differ
+            # Zerodha symbols usually come in as RELIANCE.NS, normalized?
+            # Base class normalize_symbol handles it.
+            ticker = yf.Ticker(symbol)
+            # fast_info is faster
+            price = ticker.fast_info.last_price
+            if not price:
+                # Fallback
+                hist = ticker.history(period="1d")
+                if not hist.empty:
+                    price = hist['Close'].iloc[-1]
+                else:
+                    price = 0.0
+            return to_decimal(price) if price else _ZERO
+        except:
+            return _ZERO
+
     async def get_quote(self, symbol: str) -> Decimal:
-        if self.is_paper: 
-            try:
-                import yfinance as yf
-                # yfinance needs suffixes .NS or .BO, symbol might differ
-                # Zerodha symbols usually come in as RELIANCE.NS, normalized?
-                # Base class normalize_symbol handles it.
-                ticker = yf.Ticker(symbol)
-                # fast_info is faster
-                price = ticker.fast_info.last_price
-                if not price:
-                    # Fallback
-                    hist = ticker.history(period="1d")
-                    if not hist.empty:
-                        price = hist['Close'].iloc[-1]
-                    else:
-                        price = 0.0
-                return Decimal(str(price)) if price else Decimal("0.00")
-            except:
-                return Decimal("0.00")
-        
         try:
-            loop = asyncio.get_running_loop()
             exchange_symbol = self.get_exchange_symbol(symbol)
-            quote = await loop.run_in_executor(self._executor, lambda: self.kite.quote(exchange_symbol))
-            return Decimal(str(quote[exchange_symbol]['last_price']))
+            ticks = self._ticks
+            if ticks is not None:
+                price = ticks.last_price(exchange_symbol)
+                if price is not None:
+                    return price
+                if not ticks.is_subscribed(exchange_symbol):
+                    # Subscribe in the background; this call is served over REST
+                    ticks.subscribe_soon(exchange_symbol)
+            if self._quote_cache is not None:
+                cached = self._quote_cache.get(exchange_symbol)
+                if cached is not None:
+                    return cached
+            return await self._inflight.do(("quote", exchange_symbol), self._fetch_quote, exchange_symbol)
+        except Exception as e:
+            logger.error("kite_get_quote_error", symbol=symbol, error=str(e))
+            raise BrokerError(f"Kite quote failed for {symbol}") from e
+
+    async def _fetch_quote(self, exchange_symbol: str) -> Decimal:
+        fut = self._quote_batch.get(exchange_symbol)
+        if fut is None:
+            fut = asyncio.get_running_loop().create_future()
+            self._quote_batch[exchange_symbol] = fut
+            if self._quote_flush is None:
+                self._quote_flush = asyncio.create_task(self._flush_quotes())
+        return await fut
+
+    async def _flush_quotes(self) -> None:
+        """Sends every quote requested during the batch window as multi-instrument /quote calls."""
+        batch: Dict[str, asyncio.Future] = {}
+        try:
+            await asyncio.sleep(_QUOTE_BATCH_WINDOW_SECONDS)
+            batch, self._quote_batch = self._quote_batch, {}
+            self._quote_flush = None
+            symbols = list(batch)
+            # First batch per exchange goes out by name while its tokens load
+            for exchange in {symbol.split(":", 1)[0] for symbol in symbols}:
+                self._tokens.load_soon(exchange)
+            chunks = [symbols[i:i + _QUOTE_BATCH_SIZE] for i in range(0, len(symbols), _QUOTE_BATCH_SIZE)]
+            await asyncio.gather(*(self._resolve_quotes(chunk, batch) for chunk in chunks))
+        finally:
+            if self._quote_flush is asyncio.current_task():
+                # Cancelled during the batch window: take the batch so its waiters fail below
+                batch, self._quote_batch = self._quote_batch, {}
+                self._quote_flush = None
+            # Waiters have no timeout of their own; never leave one unresolved
+            _fail_unresolved(batch)
+
+    async def _resolve_quotes(self, symbols: list, batch: Dict[str, asyncio.Future]) -> None:
+        # Token-addressed instruments skip Kite's server-side name lookup and
+        # keep the URL short; Kite keys their quotes by the token as a string
+        keys = {}
+        for symbol in symbols:
+            token = self._tokens.get(symbol)
+            keys[symbol] = symbol if token is None else str(token)
+        try:
+            quotes = await self._call_kite(self._api.quote, *keys.values()) or {}
         except Exception as e:
-            logger.error("kite_get_quote_error", error=str(e))
-            return Decimal("0.00")
+            for symbol in symbols:
+                if not batch[symbol].done():
+                    batch[symbol].set_exception(e)
+            return
+        for symbol in symbols:
+            fut = batch[symbol]
+            if fut.done():
+                continue
+            try:
+                quote = quotes.get(keys[symbol])
+                if quote is None:
+                    fut.set_exception(BrokerError(f"Kite returned no quote for {symbol}"))
+                    continue
+                price = to_decimal(quote['last_price'])
+            except Exception as e:
+                fut.set_exception(BrokerError(f"Kite returned a malformed quote for {symbol}: {e!r}"))
+                continue
+            if self._quote_cache is not None:
+                self._quote_cache.put(symbol, price)
+            fut.set_result(price)
 
     async def get_positions(self) -> Dict[str, Position]:
         if self.is_paper: return {}
-        
+        cached = self._account_cache.get("positions")
+        if cached is None:
+            cached = await self._inflight.do("positions", self._fetch_positions)
+        return dict(cached)
+
+    async def _fetch_positions(self) -> Dict[str, Position]:
         try:
-            loop = asyncio.get_running_loop()
-            
             # Fetch both Holdings (T+1) and Positions (Today/T+0)
-            holdings_future = loop.run_in_executor(self._executor, self.kite.holdings)
-            positions_future = loop.run_in_executor(self._executor, self.kite.positions)
+            holdings_future = self._call_kite(self._api.holdings)
+            positions_future = self._call_kite(self._api.positions)
             
             holdings, positions_resp = await asyncio.gather(holdings_future, positions_future)
             
@@ -118,10 +431,10 @@ class ZerodhaTrader(IndiaBroker):
                 elif exchange == 'BSE' and not symbol.endswith('.BO'):
                     symbol = f"{symbol}.BO"
                 
-                qty = Decimal(str(h['quantity']))
+                qty = to_decimal(h['quantity'])
                 if qty > 0:
-                    avg_price = Decimal(str(h['average_price']))
-                    curr_price = Decimal(str(h['last_price']))
+                    avg_price = to_decimal(h['average_price'])
+                    curr_price = to_decimal(h['last_price'])
                     combined_positions[symbol] = Position(
                         symbol=symbol,
                         quantity=qty,
@@ -140,14 +453,14 @@ class ZerodhaTrader(IndiaBroker):
                 elif exchange == 'BSE' and not symbol.endswith('.BO'):
                     symbol = f"{symbol}.BO"
                 
-                qty = Decimal(str(p['quantity']))
+                qty = to_decimal(p['quantity'])
                 # If quantity is not 0 (open position)
                 if qty != 0:
                     current_qty = qty
                     existing = combined_positions.get(symbol)
                     
-                    avg_price = Decimal(str(p['average_price']))
-                    curr_price = Decimal(str(p['last_price']))
+                    avg_price = to_decimal(p['average_price'])
+                    curr_price = to_decimal(p['last_price'])
 
                     if existing:
                         # Additive logic: Holdings (T+1) + Net Position (Today's change)
@@ -183,7 +496,9 @@ class ZerodhaTrader(IndiaBroker):
                         )
 
             # Filter out zero/negative positions (closed out)
-            return {k: v for k, v in combined_positions.items() if v.quantity > 0}
+            result = {k: v for k, v in combined_positions.items() if v.quantity > 0}
+            self._account_cache.put("positions", result, ttl=settings.positions_cache_ttl_seconds)
+            return result
             
         except Exception as e:
             logger.error("kite_get_positions_failed", error=str(e))
@@ -191,49 +506,59 @@ class ZerodhaTrader(IndiaBroker):
 
     async def get_account_balance(self) -> Decimal:
         if self.is_paper: return Decimal(str(settings.india_max_capital))
+        cached = self._account_cache.get("balance")
+        if cached is not None:
+            return cached
+        return await self._inflight.do("balance", self._fetch_balance)
+
+    async def _fetch_balance(self) -> Decimal:
         try:
-             loop = asyncio.get_running_loop()
-             margins = await loop.run_in_executor(self._executor, self.kite.margins)
-             return Decimal(str(margins['equity']['available']['cash']))
-        except Exception:
-            return Decimal("0.00")
+             margins = await self._call_kite(self._api.margins)
+             balance = to_decimal(margins['equity']['available']['cash'])
+             self._account_cache.put("balance", balance, ttl=settings.balance_cache_ttl_seconds)
+             return balance
+        except Exception as e:
+            logger.error("kite_get_balance_error", error=str(e))
+            raise BrokerError("Kite balance unavailable") from e
+
+    async def _place_order_paper(self, symbol: str, quantity: Decimal, side: str, order_type: str = "market", price: Optional[Decimal] = None) -> Order:
+        trade_symbol = self.normalize_symbol(symbol)
+        logger.info("kite_paper_order", symbol=trade_symbol, side=side, exchange=self.detect_exchange(symbol))
+        # Every field is built here with the right type, so skip validation
+        return Order.model_construct(
+            order_id=next(self._paper_ids),
+            symbol=trade_symbol,
+            side=side,
+            quantity=to_decimal(quantity),
+            status="filled",
+            timestamp=datetime.now()
+        )
 
     async def place_order(self, symbol: str, quantity: Decimal, side: str, order_type: str = "market", price: Optional[Decimal] = None) -> Order:
         trade_symbol = self.normalize_symbol(symbol)
         exchange = self.detect_exchange(symbol)
         timestamp = datetime.now()
         
-        if self.is_paper:
-             logger.info("kite_paper_order", symbol=trade_symbol, side=side, exchange=exchange)
-             return Order(
-                 order_id=f"paper_kite_{timestamp.timestamp()}",
-                 symbol=trade_symbol,
-                 side=side,
-                 quantity=quantity,
-                 status="filled",
-                 timestamp=timestamp
-             )
-        
         try:
-            loop = asyncio.get_running_loop()
-            transaction_type = self.kite.TRANSACTION_TYPE_BUY if side.lower() == "buy" else self.kite.TRANSACTION_TYPE_SELL
-            kite_order_type = self.kite.ORDER_TYPE_MARKET if order_type == "market" else self.kite.ORDER_TYPE_LIMIT
-            kite_exchange = self.kite.EXCHANGE_NSE if exchange == "NSE" else self.kite.EXCHANGE_BSE
+            is_market = order_type == "market"
+            # Anything other than "buy" has always been treated as a sell
+            transaction_type = self._txn_types.get(side.lower(), self._txn_sell)
+            kite_order_type = self._order_types["market"] if is_market else self._order_types["limit"]
+            kite_exchange = self._exchanges.get(exchange, self._exchanges["BSE"])
             
-            def execute():
-                return self.kite.place_order(
-                    variety=self.kite.VARIETY_REGULAR,
+            async with self._limit:
+                order_id = await self._api.place_order(
+                    self._variety,
                     exchange=kite_exchange,
                     tradingsymbol=trade_symbol,
                     transaction_type=transaction_type,
                     quantity=int(quantity),
-                    product=self.kite.PRODUCT_CNC,
+                    product=self._product,
                     order_type=kite_order_type,
-                    price=float(price) if price and kite_order_type != self.kite.ORDER_TYPE_MARKET else None
+                    price=format(price, "f") if price and not is_market else None
                 )
-            
-            order_id = await loop.run_in_executor(self._executor, execute)
             logger.info("kite_order_placed", order_id=order_id, symbol=trade_symbol)
+            self._account_cache.clear()
             return Order(
                 order_id=str(order_id),
                 symbol=trade_symbol,
@@ -246,5 +571,99 @@ class ZerodhaTrader(IndiaBroker):
             logger.error("kite_order_failed", error=str(e))
             return Order(order_id="error", symbol=trade_symbol, side=side, quantity=quantity, status="failed", timestamp=timestamp)
 
+    def place_order_nowait(self, symbol: str, quantity: Decimal, side: str, order_type: str = "market", price: Optional[Decimal] = None) -> "asyncio.Task[Order]":
+        """
+        Submits an order without waiting for Kite's ACK.
+
+        Returns a task that resolves to the placed `Order`, so the caller can
+        pipeline further orders or signal computation while the HTTP request
+        is in flight. Must be called from within the running event loop.
+        """
+        task = asyncio.create_task(self.place_order(symbol, quantity, side, order_type=order_type, price=price))
+        # Hold a reference until the ACK arrives so the task is not garbage collected
+        self._pending_orders.add(task)
+        task.add_done_callback(self._pending_orders.discard)
+        return task
+
     async def get_option_chain(self, symbol: str) -> list:
-        return []
+        """
+        Nearest-expiry option contracts for an underlying (e.g. "NIFTY", "RELIANCE.NS").
+
+        Served from the NFO instrument dump, so prices are the dump's last
+        traded price and volume / open interest / IV are not populated.
+        """
+        if self.is_paper:
+            return []
+        try:
+            index = self._option_index.get(_OPTION_SEGMENT)
+            if index is None:
+                index = await self._inflight.do(("instruments", _OPTION_SEGMENT), self._load_option_index)
+            expiries = index.get(self.normalize_symbol(symbol))
+            if not expiries:
+                return []
+            today = date.today().isoformat()
+            expiry = next((e for e in expiries if e >= today), None)
+            if expiry is None:
+                return []
+        except Exception as e:
+            logger.error("kite_option_chain_error", symbol=symbol, error=str(e))
+            return []
+
+        from ..market_data import OptionData
+
+        return [
+            OptionData(
+                symbol=symbol,
+                strike=row["strike"],
+                expiry=expiry,
+                option_type=_OPTION_TYPES[row["instrument_type"]],
+                last_price=row["last_price"],
+                volume=0,
+                open_interest=0,
+                implied_volatility=0.0,
+            )
+            for row in expiries[expiry]
+        ]
+
+    async def _load_option_index(self) -> OptionIndex:
+        ttl = settings.kite_instruments_cache_ttl_seconds
+        loop = asyncio.get_running_loop()
+        # The dump is several MB of JSON on disk; read and index it off the loop
+        rows = None
+        if ttl > 0:
+            rows = await loop.run_in_executor(
+                None, self._instrument_files.get, "kite_instruments", _OPTION_SEGMENT, ttl
+            )
+        if rows is None:
+            # Not through the breaker: the dump takes longer than its per-call timeout
+            async with self._limit:
+                dump = await self._api.instruments(_OPTION_SEGMENT)
+            rows = [
+                {field: inst[field] for field in _OPTION_FIELDS}
+                for inst in dump
+                if inst["instrument_type"] in _OPTION_TYPES
+            ]
+            if ttl > 0:
+                await loop.run_in_executor(
+                    None, self._instrument_files.put, "kite_instruments", _OPTION_SEGMENT, rows
+                )
+        index = await loop.run_in_executor(None, _index_options, rows)
+        self._option_index.put(_OPTION_SEGMENT, index)
+        return index
+
+    async def aclose(self) -> None:
+        # Let in-flight order submissions report back before shutting down
+        if self._pending_orders:
+            await asyncio.gather(*self._pending_orders, return_exceptions=True)
+        if self._ticks is not None:
+            self._ticks.close()
+            self._ticks = None
+        if self._quote_flush is not None:
+            # A flush cancelled before it starts never runs its cleanup
+            self._quote_flush.cancel()
+            self._quote_flush = None
+        batch, self._quote_batch = self._quote_batch, {}
+        _fail_unresolved(batch)
+        if not self.is_paper:
+            self._tokens.close()
+            await self._api.aclose()
@@ -1,15 +1,61 @@
 import asyncio
+import aiohttp
 import yfinance as yf
 import pandas as pd
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
+from dataclasses import asdict, dataclass
 from datetime import datetime
 import structlog
-from concurrent.futures import ThreadPoolExecutor
+
+from . import SHARED_IO_POOL
+from .cache import FileCache, SingleFlight, TTLCache
+from .http import create_session, json_loads
+from agent_config import settings
 
 logger = structlog.get_logger()
 
-class MarketSnapshot(BaseModel):
+YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+# Yahoo rejects requests without a browser-like User-Agent
+YAHOO_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+# yf.Ticker builds URLs and a requests session; reuse one per symbol
+_tickers: Dict[str, yf.Ticker] = {}
+
+
+def _ticker(symbol: str) -> yf.Ticker:
+    ticker = _tickers.get(symbol)
+    if ticker is None:
+        ticker = _tickers[symbol] = yf.Ticker(symbol)
+    return ticker
+
+
+def _frame_to_json(df: pd.DataFrame) -> Dict[str, Any]:
+    """Encodes an OHLCV frame for the file cache, keeping its index and dtypes exact."""
+    index = df.index
+    return {
+        "index": index.asi8.tolist(),
+        "index_name": index.name,
+        "tz": str(index.tz) if getattr(index, "tz", None) else None,
+        "columns": list(df.columns),
+        "dtypes": [str(t) for t in df.dtypes],
+        "data": df.values.tolist(),
+    }
+
+
+def _frame_from_json(raw: Dict[str, Any]) -> pd.DataFrame:
+    index = pd.to_datetime(raw["index"], utc=bool(raw["tz"]))
+    if raw["tz"]:
+        index = index.tz_convert(raw["tz"])
+    index.name = raw["index_name"]
+    df = pd.DataFrame(raw["data"], index=index, columns=raw["columns"])
+    return df.astype(dict(zip(raw["columns"], raw["dtypes"])))
+
+
+# Plain slotted dataclasses rather than pydantic models: these are built in
+# bulk (one OptionData per strike) from values already typed by this module,
+# so validation buys nothing and a per-instance __dict__ costs memory.
+@dataclass(slots=True, frozen=True, kw_only=True)
+class MarketSnapshot:
     symbol: str
     price: float
     timestamp: datetime
@@ -19,7 +65,18 @@ class MarketSnapshot(BaseModel):
     low: float
     close: float
 
-class OptionData(BaseModel):
+    def to_json(self) -> Dict[str, Any]:
+        raw = asdict(self)
+        raw["timestamp"] = self.timestamp.isoformat()
+        return raw
+
+    @classmethod
+    def from_json(cls, raw: Dict[str, Any]) -> "MarketSnapshot":
+        return cls(**{**raw, "timestamp": datetime.fromisoformat(raw["timestamp"])})
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class OptionData:
     symbol: str
     strike: float
     expiry: str
@@ -31,135 +88,315 @@ class OptionData(BaseModel):
     open_interest: int
     implied_volatility: float
 
+# yfinance option-chain column -> OptionData field
+_OPTION_COLUMNS = {
+    "strike": "strike",
+    "lastPrice": "last_price",
+    "bid": "bid",
+    "ask": "ask",
+    "volume": "volume",
+    "openInterest": "open_interest",
+    "impliedVolatility": "implied_volatility",
+}
+
+
+def _option_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Converts a yfinance calls/puts frame to OptionData kwargs column-wise (no per-row Series)."""
+    frame = frame.reindex(columns=list(_OPTION_COLUMNS)).fillna(
+        {"bid": 0.0, "ask": 0.0, "volume": 0, "openInterest": 0}
+    )
+    frame = frame.astype({"volume": "int64", "openInterest": "int64"})
+    return frame.rename(columns=_OPTION_COLUMNS).to_dict("records")
+
+
+_INTRADAY_SUFFIXES = ("m", "h")
+_PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+
+
+def _chart_to_frame(result: Dict[str, Any], interval: str) -> pd.DataFrame:
+    """
+    Builds a yfinance-style history frame from a v8 chart result.
+
+    Columns are built whole from the JSON arrays (no per-row Python loop).
+    Matches `Ticker.history()` defaults: OHLC adjusted for splits and
+    dividends, Dividends / Stock Splits columns, and an index named "Date"
+    in the exchange timezone (midnight-normalized for daily and longer bars).
+    """
+    timestamps = result.get("timestamp") or []
+    if not timestamps:
+        return pd.DataFrame()
+    quote = (result.get("indicators", {}).get("quote") or [{}])[0]
+    tz = (result.get("meta") or {}).get("exchangeTimezoneName") or "UTC"
+
+    index = pd.to_datetime(timestamps, unit="s", utc=True).tz_convert(tz)
+    intraday = interval.endswith(_INTRADAY_SUFFIXES)
+    if not intraday:
+        index = index.normalize()
+    index.name = "Date"
+
+    def column(values) -> pd.Series:
+        return pd.Series(values or [None] * len(index), index=index, dtype="float64")
+
+    df = pd.DataFrame({field.capitalize(): column(quote.get(field))
+                       for field in ("open", "high", "low", "close", "volume")})
+    adjclose = (result.get("indicators", {}).get("adjclose") or [{}])[0].get("adjclose")
+    if adjclose:
+        ratio = (column(adjclose) / df["Close"]).fillna(1.0)
+        df[_PRICE_COLUMNS] = df[_PRICE_COLUMNS].mul(ratio, axis=0)
+    df = df.dropna(subset=_PRICE_COLUMNS, how="all")
+    # The live bar can share a normalized date with the last daily bar
+    df = df[~df.index.duplicated(keep="last")]
+    df["Volume"] = df["Volume"].fillna(0).astype("int64")
+
+    events = result.get("events") or {}
+
+    def event_column(name: str, value) -> pd.Series:
+        items = (events.get(name) or {}).values()
+        if not items:
+            return pd.Series(0.0, index=df.index)
+        when = pd.to_datetime([e["date"] for e in items], unit="s", utc=True).tz_convert(tz)
+        if not intraday:
+            when = when.normalize()
+        amounts = pd.Series([value(e) for e in items], index=when, dtype="float64")
+        return amounts.groupby(level=0).sum().reindex(df.index, fill_value=0.0)
+
+    df["Dividends"] = event_column("dividends", lambda e: e["amount"])
+    df["Stock Splits"] = event_column("splits", lambda e: e["numerator"] / e["denominator"])
+    return df
+
+
+def _is_missing_symbol(error: Exception) -> bool:
+    """True if Yahoo rejected the symbol itself (worth retrying with a suffix)."""
+    message = str(error)
+    return "No data found" in message or "delisted" in message or "currentTradingPeriod" in message
+
+
 class MarketDataFetcher:
     def __init__(self, broker: Optional[Any] = None):
-        self._executor = ThreadPoolExecutor(max_workers=5)
+        self._executor = SHARED_IO_POOL
+        self._client: Optional[aiohttp.ClientSession] = None
+        self._memory_cache = TTLCache(maxsize=1024)
+        self._disk_cache = FileCache(settings.market_data_cache_dir)
+        self._inflight = SingleFlight()
         self.broker = broker
 
+    async def __aenter__(self) -> "MarketDataFetcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the shared HTTP session."""
+        if self._client is not None and not self._client.closed:
+            await self._client.close()
+        self._client = None
+
+    def _cache_get(self, namespace: str, key: tuple, ttl: float, decode) -> Any:
+        """Looks a result up in memory, then on disk. Returns None on a miss."""
+        if ttl <= 0:
+            return None
+        value = self._memory_cache.get((namespace, key))
+        if value is not None:
+            return value
+        raw = self._disk_cache.get(namespace, key, ttl)
+        if raw is None:
+            return None
+        try:
+            value = decode(raw)
+        except Exception:
+            return None
+        self._memory_cache.put((namespace, key), value, ttl=ttl)
+        return value
+
+    def _cache_put(self, namespace: str, key: tuple, ttl: float, value: Any, encode) -> None:
+        if ttl <= 0:
+            return
+        self._memory_cache.put((namespace, key), value, ttl=ttl)
+        try:
+            raw = encode(value)
+        except Exception:
+            return
+        self._disk_cache.put(namespace, key, raw)
+
+    def _session(self) -> aiohttp.ClientSession:
+        # One keep-alive session for all Yahoo requests made by this fetcher
+        if self._client is None or self._client.closed:
+            self._client = create_session(limit=50, limit_per_host=20, headers=YAHOO_HEADERS)
+        return self._client
+
+    async def _fetch_chart(self, symbol: str, params: Dict[str, str]) -> Dict[str, Any]:
+        """Fetches one result from Yahoo's v8 chart API."""
+        async with self._session().get(YAHOO_CHART_URL.format(symbol=symbol), params=params) as resp:
+            payload = await resp.json(content_type=None, loads=json_loads)
+        chart = payload.get("chart") or {}
+        error = chart.get("error")
+        if error:
+            raise ValueError(f"{error.get('code')}: {error.get('description')}")
+        results = chart.get("result")
+        if not results:
+            raise ValueError(f"No data found for {symbol}")
+        return results[0]
+
     async def get_current_price(self, symbol: str) -> Optional[MarketSnapshot]:
         """Fetches current market data snapshot. Prioritizes Broker API for real-time data."""
+        ttl = settings.quote_snapshot_ttl_seconds
+        snapshot = self._cache_get("quote", (symbol,), ttl, MarketSnapshot.from_json)
+        if snapshot is None:
+            # Concurrent callers for the same symbol share one fetch
+            snapshot = await self._inflight.do(("quote", symbol), self._load_current_price, symbol)
+        return snapshot
+
+    async def get_current_prices(self, symbols: List[str]) -> Dict[str, Optional[MarketSnapshot]]:
+        """
+        Fetches snapshots for many symbols concurrently over the shared session.
+
+        Duplicate symbols are fetched once. Yahoo's keyless endpoints have no
+        multi-symbol OHLCV call (yf.download also fetches per ticker), so the
+        batch is a concurrent fan-out rather than a single request.
+        """
+        unique = list(dict.fromkeys(symbols))
+        snapshots = await asyncio.gather(*(self.get_current_price(s) for s in unique))
+        return dict(zip(unique, snapshots))
+
+    async def _load_current_price(self, symbol: str) -> Optional[MarketSnapshot]:
+        snapshot = await self._fetch_current_price(symbol)
+        if snapshot is not None:
+            self._cache_put("quote", (symbol,), settings.quote_snapshot_ttl_seconds, snapshot,
+                            MarketSnapshot.to_json)
+        return snapshot
+
+    async def _broker_price(self, symbol: str) -> float:
         try:
-            price = 0.0
-            # 1. Try Broker First (Real-time)
-            if self.broker:
-                try:
-                    # broker.get_quote should return a Decimal or float
-                    price_decimal = await self.broker.get_quote(symbol)
-                    price = float(price_decimal)
-                except Exception:
-                    pass # Fallback to yfinance
+            # broker.get_quote should return a Decimal or float
+            return float(await self.broker.get_quote(symbol))
+        except Exception:
+            return 0.0  # Fallback to Yahoo
 
-            loop = asyncio.get_running_loop()
-            ticker = await loop.run_in_executor(self._executor, yf.Ticker, symbol)
-            
-            # Use broker price if available (and > 0), else yfinance
-            final_price = price
+    async def _fetch_current_price(self, symbol: str) -> Optional[MarketSnapshot]:
+        # 1. Broker quote (real-time) runs alongside the chart call rather than before it
+        broker_price = asyncio.ensure_future(self._broker_price(symbol)) if self.broker else None
+
+        # Bare Indian tickers only resolve on Yahoo with an exchange suffix
+        candidates = [symbol]
+        if not symbol.endswith(".NS") and not symbol.endswith(".BO"):
+            candidates.append(f"{symbol}.NS")
+
+        error: Optional[Exception] = None
+        for candidate in candidates:
+            if error is not None:
+                logger.info("retrying_with_ns_suffix", symbol=symbol)
+            try:
+                # One chart call returns both the live price and today's OHLCV
+                result = await self._fetch_chart(candidate, {"range": "1d", "interval": "1d", "includePrePost": "false"})
+            except Exception as e:
+                error = e
+                if _is_missing_symbol(e):
+                    continue
+                break
+            meta = result.get("meta") or {}
+            quote = (result.get("indicators", {}).get("quote") or [{}])[0]
+
+            def last(field: str) -> Optional[float]:
+                values = [v for v in quote.get(field) or [] if v is not None]
+                return values[-1] if values else None
+
+            close = last("close")
+            if close is None:
+                error = ValueError(f"No history data found for {candidate}")
+                continue
+
+            # Use broker price if available (and > 0), else Yahoo's live price
+            final_price = await broker_price if broker_price is not None else 0.0
             if final_price <= 0:
-                try:
-                    # fast_info access can fail/block, run in executor
-                    final_price = await loop.run_in_executor(self._executor, lambda: ticker.fast_info.last_price)
-                except Exception:
-                    final_price = 0.0
-            
-            # For Volume/OHLC we still need history from yfinance usually
-            history = await loop.run_in_executor(self._executor, lambda: ticker.history(period="1d"))
-            
-            if history.empty:
-                 # Raise exception to trigger retry logic
-                 raise ValueError(f"No history data found for {symbol}")
-            
-            row = history.iloc[-1]
-            
-            if final_price == 0.0:
-                final_price = float(row['Close'])
-            
+                final_price = float(meta.get("regularMarketPrice") or close)
+
             return MarketSnapshot(
-                symbol=symbol,
+                symbol=candidate,
                 price=final_price,
                 timestamp=datetime.now(),
-                volume=int(row['Volume']),
-                open=float(row['Open']),
-                high=float(row['High']),
-                low=float(row['Low']),
-                close=float(row['Close'])
+                volume=int(last("volume") or 0),
+                open=float(last("open") or close),
+                high=float(last("high") or close),
+                low=float(last("low") or close),
+                close=float(close)
             )
-        except Exception as e:
-            # Retry with .NS for Indian stocks if simplified ticker fails
-            if not symbol.endswith(".NS") and not symbol.endswith(".BO") and ("currentTradingPeriod" in str(e) or "No data found" in str(e) or "delisted" in str(e)):
-                try:
-                    logger.info("retrying_with_ns_suffix", symbol=symbol)
-                    return await self.get_current_price(f"{symbol}.NS")
-                except Exception:
-                    pass
-            
-            logger.error("fetch_price_error", symbol=symbol, error=str(e))
-            return None
+
+        if broker_price is not None:
+            broker_price.cancel()
+        logger.error("fetch_price_error", symbol=symbol, error=str(error))
+        return None
 
     async def get_history(self, symbol: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
         """Fetches historical OHLCV data."""
-        try:
-            loop = asyncio.get_running_loop()
-            ticker = await loop.run_in_executor(self._executor, yf.Ticker, symbol)
-            history = await loop.run_in_executor(self._executor, lambda: ticker.history(period=period, interval=interval))
-            return history
-        except Exception as e:
-            # Retry with .NS
-            if not symbol.endswith(".NS") and not symbol.endswith(".BO"):
-                 try:
-                    return await self.get_history(f"{symbol}.NS", period, interval)
-                 except Exception:
-                    pass
-            
-            logger.error("fetch_history_error", symbol=symbol, error=str(e))
-            return pd.DataFrame()
+        ttl = settings.history_cache_ttl_seconds
+        key = (symbol, period, interval)
+        history = self._cache_get("history", key, ttl, _frame_from_json)
+        if history is None:
+            history = await self._fetch_history(symbol, period, interval)
+            if history.empty:
+                return history
+            self._cache_put("history", key, ttl, history, _frame_to_json)
+        # Callers append indicator columns in place, so never hand out the cached frame
+        return history.copy()
+
+    async def _fetch_history(self, symbol: str, period: str, interval: str) -> pd.DataFrame:
+        params = {"range": period, "interval": interval, "includePrePost": "false", "events": "div,splits"}
+        candidates = [symbol]
+        if not symbol.endswith(".NS") and not symbol.endswith(".BO"):
+            candidates.append(f"{symbol}.NS")
+
+        error: Optional[Exception] = None
+        for candidate in candidates:
+            try:
+                result = await self._fetch_chart(candidate, params)
+                history = _chart_to_frame(result, interval)
+            except Exception as e:
+                error = e
+                if _is_missing_symbol(e):
+                    continue
+                break
+            if not history.empty:
+                return history
+            error = ValueError(f"No data found for {candidate}")
+
+        logger.error("fetch_history_error", symbol=symbol, error=str(error))
+        return pd.DataFrame()
 
     async def get_option_chain(self, symbol: str) -> List[OptionData]:
         """Fetches option chain data (Current Expiry)."""
+        ttl = settings.option_chain_cache_ttl_seconds
+        options = self._cache_get("options", (symbol,), ttl, lambda raw: [OptionData(**o) for o in raw])
+        if options is None:
+            options = await self._fetch_option_chain(symbol)
+            if not options:
+                return options
+            self._cache_put("options", (symbol,), ttl, options, lambda v: [asdict(o) for o in v])
+        # Callers may insert into the list (e.g. the dashboard's target option)
+        return list(options)
+
+    async def _fetch_option_chain(self, symbol: str) -> List[OptionData]:
         try:
             loop = asyncio.get_running_loop()
-            ticker = await loop.run_in_executor(self._executor, yf.Ticker, symbol)
+            ticker = _ticker(symbol)
             
-            # Get next expiry
-            expirations = ticker.options
+            # Get next expiry (property performs a network fetch)
+            expirations = await loop.run_in_executor(self._executor, getattr, ticker, "options")
             if not expirations:
                 return []
             
             next_expiry = expirations[0]
             
-            opts = await loop.run_in_executor(self._executor, lambda: ticker.option_chain(next_expiry))
+            opts = await loop.run_in_executor(self._executor, ticker.option_chain, next_expiry)
             
-            options_list = []
-            
-            # Process Calls
-            for _, row in opts.calls.iterrows():
-                options_list.append(OptionData(
-                    symbol=symbol,
-                    strike=row['strike'],
-                    expiry=next_expiry,
-                    option_type="call",
-                    last_price=row['lastPrice'],
-                    bid=row.get('bid', 0.0),
-                    ask=row.get('ask', 0.0),
-                    volume=int(row['volume']) if not pd.isna(row['volume']) else 0,
-                    open_interest=int(row['openInterest']) if not pd.isna(row['openInterest']) else 0,
-                    implied_volatility=row['impliedVolatility']
-                ))
-
-            # Process Puts
-            for _, row in opts.puts.iterrows():
-                options_list.append(OptionData(
-                    symbol=symbol,
-                    strike=row['strike'],
-                    expiry=next_expiry,
-                    option_type="put",
-                    last_price=row['lastPrice'],
-                    bid=row.get('bid', 0.0),
-                    ask=row.get('ask', 0.0),
-                    volume=int(row['volume']) if not pd.isna(row['volume']) else 0,
-                    open_interest=int(row['openInterest']) if not pd.isna(row['openInterest']) else 0,
-                    implied_volatility=row['impliedVolatility']
-                ))
-                
+            options_list = [
+                OptionData(symbol=symbol, expiry=next_expiry, option_type="call", **r)
+                for r in _option_records(opts.calls)
+            ]
+            options_list.extend(
+                OptionData(symbol=symbol, expiry=next_expiry, option_type="put", **r)
+                for r in _option_records(opts.puts)
+            )
             return options_list
 
         except Exception as e:
@@ -11,9 +11,12 @@ The router respects the user's broker preferences configured in agent_config.py:
   - india_fallback_broker: Fallback if the preferred India broker is unavailable
 """
 
+import asyncio
+import functools
 import structlog
-from typing import Dict, Optional, Literal
-from trader.base import Broker
+from datetime import datetime
+from typing import Dict, List, Optional, Literal
+from trader.base import Broker, Order, OrderSpec
 from strategy.market_hours import is_market_open
 
 logger = structlog.get_logger()
@@ -40,6 +43,9 @@ class BrokerRouter:
         self.india_preferred: Optional[str] = None
         self.india_fallback: Optional[str] = None
 
+        # Broker resolved per region, rebuilt whenever brokers or preferences change
+        self._region_to_broker: Dict[str, Optional[Broker]] = {"US": None, "IN": None}
+
     def register_broker(self, name: str, broker: Broker, region: MarketRegion):
         """Register an authenticated broker for a specific region."""
         if region == "US":
@@ -48,6 +54,7 @@ class BrokerRouter:
         elif region == "IN":
             self._india_brokers[name] = broker
             logger.info("broker_registered", name=name, region="IN")
+        self._rebuild_resolution()
 
     def set_preferences(self, us_preferred: str, india_preferred: str, india_fallback: Optional[str] = None):
         """Set broker preferences from config."""
@@ -56,8 +63,14 @@ class BrokerRouter:
         self.india_fallback = india_fallback
         logger.info("broker_preferences_set", 
                      us=us_preferred, india=india_preferred, india_fallback=india_fallback)
+        self._rebuild_resolution()
+
+    def _rebuild_resolution(self):
+        """Resolves the broker for each region once, so routing is a dict lookup."""
+        self._region_to_broker = {"US": self._get_us_broker(), "IN": self._get_india_broker()}
 
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def detect_region(symbol: str) -> MarketRegion:
         """
         Determines the market region from a symbol string.
@@ -78,12 +91,7 @@ class BrokerRouter:
         (get_quote, place_order, etc.) — the broker handles symbol format
         conversion internally via get_exchange_symbol().
         """
-        region = self.detect_region(symbol)
-
-        if region == "US":
-            return self._get_us_broker()
-        else:
-            return self._get_india_broker()
+        return self._region_to_broker[self.detect_region(symbol)]
 
     def _get_us_broker(self) -> Optional[Broker]:
         """Get the preferred US broker, if available."""
@@ -106,6 +114,34 @@ class BrokerRouter:
             return next(iter(self._india_brokers.values()))
         return None
 
+    async def place_orders_for_symbols(self, specs: List[OrderSpec]) -> List[Order]:
+        """
+        Places a batch of orders, grouped per broker and submitted concurrently.
+
+        Returns one `Order` per spec in the same order; specs with no broker
+        for their region come back as failed orders.
+        """
+        results: List[Optional[Order]] = [None] * len(specs)
+        groups: Dict[int, tuple] = {}
+        for i, spec in enumerate(specs):
+            broker = self.get_broker_for_symbol(spec.symbol)
+            if broker is None:
+                logger.warning("no_broker_for_symbol", symbol=spec.symbol)
+                results[i] = Order(order_id="error", symbol=spec.symbol, side=spec.side,
+                                   quantity=spec.quantity, status="failed", timestamp=datetime.now())
+                continue
+            groups.setdefault(id(broker), (broker, [], []))
+            _, indices, batch = groups[id(broker)]
+            indices.append(i)
+            batch.append(spec)
+
+        batches = list(groups.values())
+        placed = await asyncio.gather(*(broker.place_orders(batch) for broker, _, batch in batches))
+        for (_, indices, _), orders in zip(batches, placed):
+            for i, order in zip(indices, orders):
+                results[i] = order
+        return results
+
     def is_market_open_for_symbol(self, symbol: str) -> bool:
         """Checks if the relevant market is open for this symbol."""
         return is_market_open(symbol)
@@ -124,3 +160,11 @@ class BrokerRouter:
         us = [f"{name} (US)" for name in self._us_brokers]
         india = [f"{name} (IN)" for name in self._india_brokers]
         return us + india
+
+    async def aclose(self):
+        """Closes every registered broker's network resources."""
+        for name, broker in {**self._us_brokers, **self._india_brokers}.items():
+            try:
+                await broker.aclose()
+            except Exception as e:
+                logger.error("broker_close_failed", name=name, error=str(e))
@@ -8,6 +8,7 @@ Each concrete US broker overrides `get_exchange_symbol()` to produce the
 format its API expects.
 """
 
+import functools
 from abc import ABC
 from trader.base import Broker
 
@@ -26,6 +27,7 @@ class USBroker(Broker, ABC):
     EXCHANGES = ["NYSE", "NASDAQ", "AMEX"]
 
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def normalize_symbol(symbol: str) -> str:
         """
         Strips any non-US suffixes to get a clean US ticker.
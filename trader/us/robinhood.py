@@ -5,17 +5,19 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 import structlog
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 
 from .base import USBroker
-from ..base import Position, Order
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from .. import SHARED_IO_POOL
+from ..base import BrokerError, Position, Order, paper_order_ids, to_decimal
+from ..breaker import broker_breaker
+from ..cache import SingleFlight, TTLCache
 from agent_config import settings
 
 logger = structlog.get_logger()
 
+_ZERO = Decimal("0.00")
+_PAPER_FILL_PRICE = Decimal("100.00")
+
 class RobinhoodTrader(USBroker):
     """
     Robinhood broker — US market.
@@ -24,13 +26,33 @@ class RobinhoodTrader(USBroker):
     """
 
     def __init__(self):
-        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._executor = SHARED_IO_POOL
         self.is_paper = settings.trading_mode == "paper"
+        if self.is_paper:
+            # Trading mode is fixed for the process: bind the paper paths once
+            # instead of branching on every call
+            self.get_quote = self._get_quote_paper
+            self.place_order = self._place_order_paper
+            self._paper_ids = paper_order_ids("paper")
+        self._breaker = broker_breaker("robinhood")
+        # Caps concurrent robin_stocks calls; identical in-flight reads share one request
+        self._limit = asyncio.Semaphore(settings.broker_max_concurrency)
+        self._inflight = SingleFlight()
+        self._quote_cache = None
+        if settings.quote_cache_ttl_seconds > 0:
+            self._quote_cache = TTLCache(maxsize=2048, ttl=settings.quote_cache_ttl_seconds)
+        # Account state only changes on fills; reuse it briefly, drop it after an order
+        self._account_cache = TTLCache(maxsize=2)
 
     def get_exchange_symbol(self, symbol: str) -> str:
         """Robinhood uses plain uppercase tickers."""
         return self.normalize_symbol(symbol)
 
+    async def _call_rh(self, fn, *args: Any) -> Any:
+        """Runs a blocking robin_stocks call on the I/O pool under the concurrency cap and breaker."""
+        async with self._limit:
+            return await self._breaker.call(asyncio.get_running_loop().run_in_executor, self._executor, fn, *args)
+
     async def authenticate(self) -> bool:
         if self.is_paper:
             logger.info("rh_paper_trading_auth_simulated")
@@ -54,51 +76,66 @@ class RobinhoodTrader(USBroker):
             logger.error("rh_login_failed", error=str(e))
             return False
 
+    async def _get_quote_paper(self, symbol: str) -> Decimal:
+        try:
+            import yfinance as yf
+            ticker = yf.Ticker(self.get_exchange_symbol(symbol))
+            # fast_info is faster and reliable for US stocks
+            price = ticker.fast_info.last_price
+            if not price:
+                # Fallback
+                hist = ticker.history(period="1d")
+                price = hist['Close'].iloc[-1] if not hist.empty else 0.0
+            return to_decimal(price) if price else _ZERO
+        except:
+            return _ZERO
+
     async def get_quote(self, symbol: str) -> Decimal:
         exchange_symbol = self.get_exchange_symbol(symbol)
-        
-        if self.is_paper:
-            try:
-                import yfinance as yf
-                ticker = yf.Ticker(exchange_symbol)
-                # fast_info is faster and reliable for US stocks
-                price = ticker.fast_info.last_price
-                if not price:
-                    # Fallback
-                    hist = ticker.history(period="1d")
-                    price = hist['Close'].iloc[-1] if not hist.empty else 0.0
-                return Decimal(str(price)) if price else Decimal("0.00")
-            except:
-                return Decimal("0.00")
+        if self._quote_cache is not None:
+            cached = self._quote_cache.get(exchange_symbol)
+            if cached is not None:
+                return cached
+        return await self._inflight.do(("quote", exchange_symbol), self._fetch_quote, exchange_symbol)
 
+    async def _fetch_quote(self, exchange_symbol: str) -> Decimal:
         try:
-            loop = asyncio.get_running_loop()
-            quotes = await loop.run_in_executor(self._executor, lambda: rh.get_quotes(exchange_symbol))
+            quotes = await self._call_rh(rh.get_quotes, exchange_symbol)
             if quotes and len(quotes) > 0:
-                return Decimal(str(quotes[0]['last_trade_price']))
-            return Decimal("0.00")
+                price = to_decimal(quotes[0]['last_trade_price'])
+                if self._quote_cache is not None:
+                    self._quote_cache.put(exchange_symbol, price)
+                return price
         except Exception as e:
-            logger.error("rh_get_quote_error", error=str(e))
-            return Decimal("0.00")
+            logger.error("rh_get_quote_error", symbol=exchange_symbol, error=str(e))
+            raise BrokerError(f"Robinhood quote failed for {exchange_symbol}") from e
+        raise BrokerError(f"Robinhood returned no quote for {exchange_symbol}")
 
     async def get_positions(self) -> Dict[str, Position]:
         if self.is_paper:
             return {}
+        cached = self._account_cache.get("positions")
+        if cached is None:
+            cached = await self._inflight.do("positions", self._fetch_positions)
+        return dict(cached)
 
+    async def _fetch_positions(self) -> Dict[str, Position]:
         try:
-            loop = asyncio.get_running_loop()
-            my_positions = await loop.run_in_executor(self._executor, rh.build_holdings)
+            my_positions = await self._call_rh(rh.build_holdings)
             
-            positions = {}
-            for symbol, data in my_positions.items():
-                positions[symbol] = Position(
+            # build_holdings returns numeric strings, which Decimal parses directly
+            positions = {
+                symbol: Position(
                     symbol=symbol,
-                    quantity=Decimal(str(data['quantity'])),
-                    average_price=Decimal(str(data['average_buy_price'])),
-                    current_price=Decimal(str(data['price'])),
-                    market_value=Decimal(str(data['equity'])),
-                    unrealized_pnl=Decimal(str(data['equity_change']))
+                    quantity=to_decimal(data['quantity']),
+                    average_price=to_decimal(data['average_buy_price']),
+                    current_price=to_decimal(data['price']),
+                    market_value=to_decimal(data['equity']),
+                    unrealized_pnl=to_decimal(data['equity_change'])
                 )
+                for symbol, data in my_positions.items()
+            }
+            self._account_cache.put("positions", positions, ttl=settings.positions_cache_ttl_seconds)
             return positions
         except Exception as e:
             logger.error("rh_get_positions_error", error=str(e))
@@ -107,41 +144,47 @@ class RobinhoodTrader(USBroker):
     async def get_account_balance(self) -> Decimal:
         if self.is_paper:
             return Decimal(str(settings.us_max_capital))
+        cached = self._account_cache.get("balance")
+        if cached is not None:
+            return cached
+        return await self._inflight.do("balance", self._fetch_balance)
 
+    async def _fetch_balance(self) -> Decimal:
         try:
-            loop = asyncio.get_running_loop()
-            profile = await loop.run_in_executor(self._executor, rh.load_account_profile)
-            return Decimal(str(profile['portfolio_cash']))
+            profile = await self._call_rh(rh.load_account_profile)
+            balance = to_decimal(profile['portfolio_cash'])
+            self._account_cache.put("balance", balance, ttl=settings.balance_cache_ttl_seconds)
+            return balance
         except Exception as e:
             logger.error("rh_get_balance_error", error=str(e))
-            return Decimal("0.00")
+            raise BrokerError("Robinhood balance unavailable") from e
+
+    async def _place_order_paper(self, symbol: str, quantity: Decimal, side: str, order_type: str = "market", price: Optional[Decimal] = None) -> Order:
+        exchange_symbol = self.get_exchange_symbol(symbol)
+        logger.info("rh_paper_order", symbol=exchange_symbol, side=side, quantity=quantity)
+        # Every field is built here with the right type, so skip validation
+        return Order.model_construct(
+            order_id=next(self._paper_ids),
+            symbol=exchange_symbol,
+            side=side,
+            quantity=to_decimal(quantity),
+            price=to_decimal(price) if price else _PAPER_FILL_PRICE,
+            status="filled",
+            timestamp=datetime.now()
+        )
 
     async def place_order(self, symbol: str, quantity: Decimal, side: str, order_type: str = "market", price: Optional[Decimal] = None) -> Order:
         exchange_symbol = self.get_exchange_symbol(symbol)
         timestamp = datetime.now()
-        
-        if self.is_paper:
-            logger.info("rh_paper_order", symbol=exchange_symbol, side=side, quantity=quantity)
-            return Order(
-                order_id=f"paper_{timestamp.timestamp()}",
-                symbol=exchange_symbol,
-                side=side,
-                quantity=quantity,
-                price=price or Decimal("100.00"),
-                status="filled",
-                timestamp=timestamp
-            )
 
         try:
             loop = asyncio.get_running_loop()
             
-            def execute():
-                if side == "buy":
-                    return rh.order_buy_market(exchange_symbol, float(quantity))
-                else:
-                    return rh.order_sell_market(exchange_symbol, float(quantity))
+            submit = rh.order_buy_market if side == "buy" else rh.order_sell_market
             
-            result = await loop.run_in_executor(self._executor, execute)
+            async with self._limit:
+                result = await loop.run_in_executor(self._executor, submit, exchange_symbol, float(quantity))
+            self._account_cache.clear()
             
             return Order(
                 order_id=result.get('id', 'unknown'),